@@ -8,10 +8,10 @@ from .base import load_prompt
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
-from src.tools import get_stock_info, get_stock_price
-from src.tools.memory_tools import MemoryTools
+from src.tools import get_stock_overview, get_stock_info, get_stock_price, get_more_stock_fields, get_fundamental_ratios, get_price_history, get_risk_metrics
+from src.tools.memory_tools import ScopedMemoryTools
 
-def build_financial_analyst() -> Agent:
+def build_financial_analyst(inputs: dict = None) -> Agent:
     """
     Build the financial analyst agent.
 
@@ -27,11 +27,15 @@ def build_financial_analyst() -> Agent:
     - Pulls APIs for price history: get stock data inlcuding quote and company info
     - Web Search: For recent earnings reports and analyst coverage
 
+    Args:
+        inputs: Crew inputs; the ticker and run ID scope the memory tools
+
     Returns:
         Configured fanancial analyst agent
     """
     # Load system prompt
     prompt = load_prompt('financial_analyst.md')
+    memory = ScopedMemoryTools("Financial Analyst", inputs)
     
     agent = Agent(
         role="Financial Analyst",
@@ -42,7 +46,8 @@ def build_financial_analyst() -> Agent:
         # TOOLS: This is the key differentiator! This agent can fetch real data.
         # The agent will automatically decide when to use these tools based on
         # the task description and the tool docstrings.        
-        tools=[get_stock_price, get_stock_info, MemoryTools.save_finding],
+        tools=[get_stock_overview, get_stock_price, get_stock_info, get_more_stock_fields, get_fundamental_ratios, get_price_history,
+               get_risk_metrics, memory.save_finding],
                 
         # ALLOW DELEGATION: Set to False because we want this agent to do the
         # research itself, not delegate to the writer (who has no tools anyway).
@@ -73,15 +78,33 @@ def build_financial_analyst_task(inputs: dict = None) -> Task:
   
     ticker = inputs.get("ticker") 
     investor_mode = inputs.get("investor_mode")
+
+    fetch_step = (
+        "STEP 1: Fetch Data\n"
+        f"- Start with get_stock_overview tool: it fetches the price, company profile and fundamental ratios for {ticker} in one step\n"
+        f"- Use get_stock_price, get_stock_info or get_fundamental_ratios only for a part the overview could not fetch\n"
+        "- Use get_more_stock_fields tool only if a required metric is missing from the tools above\n"
+        f"- Use get_price_history tool to summarise recent price movements for {ticker}\n"
+        f"- Use get_risk_metrics tool to fetch beta, volatility, Sharpe ratio and other risk measures for {ticker}\n"
+        "  (do NOT estimate risk measures yourself)\n\n"
+    )
+
+    # PRE-FETCHED DATA: The crew already fetched the tool results; use them directly
+    data_brief = inputs.get("data_brief")
+    if data_brief:
+        fetch_step = (
+            "STEP 1: Use the Pre-fetched Data\n"
+            f"The data below was fetched for {ticker} just before this task. Use it directly;\n"
+            "call a tool only for a metric that is missing or marked unavailable.\n"
+            f"{data_brief['financial']}\n\n"
+        )
     
     task = Task(      
        description=(
             f"Conduct a comprehensive financial analysis of {ticker}.\n\n"
             f"Investment Perspective: {investor_mode}\n\n"
             "⚠️ CRITICAL REQUIREMENTS - ALL financial metrics must be obtained:\n\n"
-            "STEP 1: Fetch Data\n"
-            f"- Use get_stock_price tool to fetch current price for {ticker}\n"
-            f"- Use get_stock_info tool to fetch company information including financial metrics for {ticker}\n\n"
+            f"{fetch_step}"
             "STEP 2: Extract/Calculate Required Metrics (ALL are mandatory):\n"
             "✓ Current Stock Price\n"
             "✓ P/E Ratio (Price-to-Earnings)\n"
@@ -92,21 +115,22 @@ def build_financial_analyst_task(inputs: dict = None) -> Task:
             "✓ Revenue Growth\n"
             "✓ EPS Growth\n"
             "✓ Profit Margin\n"
-            "✓ Operating Margin\n\n"
+            "✓ Operating Margin\n"
+            "✓ Beta, Annualized Volatility, Sharpe Ratio, Sortino Ratio, Max Drawdown, Value at Risk\n\n"
             "STEP 3: Validation\n"
             "- Before proceeding, verify you have obtained ALL metrics listed above\n"
             "- If any metric is missing from API response, mark it as 'N/A' with explanation\n"
             "- Do NOT skip any metric - every field must have a value or 'N/A'\n\n"
             "STEP 4: Save Results\n"
-            f"- Use save_finding tool to save ALL metrics to vector database\n"
+            f"- Use save_finding tool to save ALL metrics to vector database, with metric_type\n"
+            "  'price', 'fundamentals' or 'risk' as appropriate\n"
             "- Include timestamp and confirm all required fields are present\n\n"
             f"Frame your analysis from a {investor_mode.lower()} perspective.\n"
             "Remain objective and data-driven.\n\n"
-            "⚠️ IMPORTANT: If get_stock_info doesn't return ROE or ROA, you must:\n"
-            "1. Check if the data contains netIncome, totalAssets, shareholderEquity\n"
-            "2. Calculate manually: ROE = netIncome / shareholderEquity\n"
-            "3. Calculate manually: ROA = netIncome / totalAssets\n"
-            "4. If calculation impossible, mark as 'Data not available from source'\n"
+            "⚠️ IMPORTANT: Do NOT calculate ratios by hand. get_fundamental_ratios already computes\n"
+            "ROE, ROA, PEG, margins and growth from the financial statements. Report each value with\n"
+            "its 'source' ('computed' or 'reported'); if the source is 'unavailable', mark the metric\n"
+            "as 'Data not available from source'\n"
         ),
      expected_output=(
             "A structured JSON report containing ALL required financial metrics:\n"
@@ -122,12 +146,18 @@ def build_financial_analyst_task(inputs: dict = None) -> Task:
             "  'eps_growth': value or 'N/A',\n"         
             "  'profit_margin': value or 'N/A',\n"
             "  'operating_margin': value or 'N/A',\n"
+            "  'beta': value or 'N/A',\n"
+            "  'volatility': value or 'N/A',\n"
+            "  'sharpe_ratio': value or 'N/A',\n"
+            "  'sortino_ratio': value or 'N/A',\n"
+            "  'max_drawdown': value or 'N/A',\n"
+            "  'value_at_risk': value or 'N/A',\n"
             "  'analysis_timestamp': 'ISO timestamp',\n"
             "  'missing_metrics': ['list any N/A metrics with reasons']\n"
             "}\n\n"
             "Every metric must be present in the output, even if marked as N/A."
         ),
-    agent=build_financial_analyst()
+    agent=build_financial_analyst(inputs)
     )
 
     return task
\ No newline at end of file
@@ -3,6 +3,8 @@
     2. Finacial Analyst Agent analyses company-specific financial data
     3. Market Researcher Agent searches markets, extracts relevant text snippets and stores results memory"""
 
+import uuid
+
 from crewai import Agent, Crew, Process, Task
 from langchain_openai import ChatOpenAI
 from agents.base import load_prompt
@@ -10,6 +12,7 @@ from agents.manager import build_manager
 from agents.financial_analyst import build_financial_analyst, build_financial_analyst_task
 from agents.market_researcher import build_market_researcher, build_market_researcher_task
 from agents.reporter import build_reporter, build_reporter_task
+from src.tools.prefetch import build_data_brief
 
 def build_financial_crew(inputs: dict = None) -> Crew:
     """
@@ -30,10 +33,20 @@ def build_financial_crew(inputs: dict = None) -> Crew:
     
     print(f"🔨  Building crew for {ticker}...")
 
+    # PRE-FETCH: Pull the data the tasks need in code, in parallel, so the agents
+    # start from a brief instead of spending LLM round trips on tool calls
+    if inputs.get("prefetch", True) and "data_brief" not in inputs:
+        print(f"📥  Pre-fetching data for {ticker}...")
+        inputs["data_brief"] = build_data_brief(ticker)
+
+    # RUN SCOPE: Findings saved during this run are tagged with its ID, so the
+    # reporter's searches only see this run's findings about this ticker
+    inputs.setdefault("run_id", uuid.uuid4().hex[:12])
+
     # Build agents
-    financial_analyst = build_financial_analyst()
-    market_researcher = build_market_researcher()
-    reporter = build_reporter()
+    financial_analyst = build_financial_analyst(inputs)
+    market_researcher = build_market_researcher(inputs)
+    reporter = build_reporter(inputs)
        
     # Build tasks
     financial_analyst_task = build_financial_analyst_task(inputs)
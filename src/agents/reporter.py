@@ -9,9 +9,9 @@ from .base import load_prompt
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.tools.memory_tools import MemoryTools
+from src.tools.memory_tools import ScopedMemoryTools
 
-def build_reporter() -> Agent:
+def build_reporter(inputs: dict = None) -> Agent:
     """
     Build the reported agent.
 
@@ -30,18 +30,25 @@ def build_reporter() -> Agent:
 
     Tools:
     - Memory Tool: Query final results saved in vestor DB
+      (batch search to gather all sections' context in one call)
+
+    Args:
+        inputs: Crew inputs; the ticker and run ID scope the memory search
 
     Returns:
         Configured reported agent
     """
     # Load system prompt
     prompt = load_prompt('reporter.md')
+
+    # Batch search first: the whole report context in one embedding request and one query
+    memory_tools = ScopedMemoryTools("Financial Reporter", inputs)
     
     agent = Agent(
         role="Financial Reporter",
         goal=f"Produces financial report based on the final results from Financial Analyst and Merket Researcher",
         backstory=(prompt),                
-        tools=[MemoryTools.search_memory],
+        tools=[memory_tools.search_memory_batch, memory_tools.search_memory],
         verbose=True,
     )
 
@@ -72,7 +79,11 @@ def build_reporter_task(inputs: dict = None, context: list = None) -> Task:
         f"⚠ Important: This task can ONLY start after BOTH the financial analyst \n"
          "and market researcher have COMPLETED their analysis and SAVED results to the vector database.\n\n"
         f"Produce financial report for {ticker}, which is based on saved results from financial analyst and market researcher.\n\n"
-            f"First, you query the vector database\n\n"
+            f"First, you query the vector database (searches only return findings about {ticker}\n"
+            "from this analysis run; pass metric_type to narrow them down).\n"
+            "Gather your context in ONE call to 'Query Shared Memory (Batch)' with all your questions,\n"
+            "e.g. ['price movements', 'P/E and valuation ratios', 'profitability', 'recent news and sentiment',\n"
+            "'opportunities', 'risks']; use the single-query tool only for follow-ups\n\n"
             "Your responsibilities must include:\n"
             "1. Executive Summary (≤150 words)\n"
             "2. Company Snapshot\n"
@@ -100,11 +111,15 @@ def build_reporter_task(inputs: dict = None, context: list = None) -> Task:
             "'ROA': value or 'N/A'\n"
             "'Revenue Growth': value or 'N/A'\n"
             "'EPS Growth': value or 'N/A'\n"
+            "and for the Risk Metrics sub-section use the following key values\n"
+            "'Beta': value or 'N/A'\n"
+            "'Volatility': value or 'N/A'\n"
+            "'Sharpe Ratio': value or 'N/A'\n"
             "News & Sentiment\n"
             "Risks & Opportunities\n"
             "Full Report (Markdown)\n\n"
         ),        
-        agent=build_reporter(),
+        agent=build_reporter(inputs),
 
         # Use outputs of tasks from financial_analyst and market_researcher   
         context=context,
@@ -0,0 +1,101 @@
+"""
+Compare embedding backends on latency and retrieval quality for short financial snippets.
+
+Each query in the labelled set below has one relevant snippet; a backend
+scores well when that snippet ranks first among all snippets by cosine
+similarity. Backends that are not available here (no OPENAI_API_KEY, no
+sentence-transformers) are skipped.
+
+Usage (from src/):
+    python -m benchmarks.embedding_backends
+    python -m benchmarks.embedding_backends hashing openai
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import ConfigurationError
+from tools.embeddings import EMBEDDING_BACKENDS, build_embedding_function
+
+SNIPPETS = [
+    "Apple reported quarterly revenue of $94.9 billion, up 6% year over year, driven by iPhone sales.",
+    "Tesla recalled 2 million vehicles in the US over concerns with its Autopilot driver-assistance system.",
+    "Microsoft Azure cloud revenue grew 29% as demand for AI services accelerated.",
+    "NVIDIA's data center segment posted record sales on strong demand for H100 GPUs.",
+    "Amazon Web Services operating margin expanded to 38%, the highest in two years.",
+    "Alphabet faces an antitrust ruling that its search deals with Apple are illegal.",
+    "Meta raised its capital expenditure guidance to $40 billion for AI infrastructure.",
+    "The Federal Reserve held interest rates steady and signalled two cuts later this year.",
+    "JPMorgan's net interest income beat estimates as higher rates lifted lending margins.",
+    "Boeing shares fell after the FAA limited 737 MAX production following a door plug incident.",
+    "Apple's services segment, including the App Store and iCloud, hit an all-time revenue record.",
+    "Tesla's automotive gross margin fell to 17% after repeated price cuts on Model Y.",
+]
+
+# (query, index of the relevant snippet)
+QUERIES = [
+    ("How did iPhone sales affect Apple's revenue?", 0),
+    ("Tesla Autopilot safety recall", 1),
+    ("Azure growth and AI demand", 2),
+    ("NVDA GPU data center sales", 3),
+    ("AWS profitability", 4),
+    ("Google antitrust risk", 5),
+    ("Meta capex plans", 6),
+    ("Fed interest rate decision", 7),
+    ("JPMorgan net interest income", 8),
+    ("Boeing 737 MAX production cap", 9),
+    ("Apple App Store services revenue", 10),
+    ("Tesla margins after price cuts", 11),
+]
+
+
+def evaluate(embed) -> dict:
+    """Embed the corpus and queries, then score how well the relevant snippet ranks."""
+    started = time.perf_counter()
+    documents = np.asarray(embed(SNIPPETS), dtype=np.float32)
+    document_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    queries = np.asarray(embed([q for q, _ in QUERIES]), dtype=np.float32)
+    query_time = time.perf_counter() - started
+
+    documents /= np.linalg.norm(documents, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ documents.T
+
+    reciprocal_ranks, hits = [], 0
+    for row, (_, relevant) in enumerate(QUERIES):
+        ranking = np.argsort(-scores[row])
+        rank = int(np.where(ranking == relevant)[0][0]) + 1
+        reciprocal_ranks.append(1.0 / rank)
+        hits += rank == 1
+
+    return {
+        'ms_per_snippet': 1000 * document_time / len(SNIPPETS),
+        'ms_per_query': 1000 * query_time / len(QUERIES),
+        'recall_at_1': hits / len(QUERIES),
+        'mrr': sum(reciprocal_ranks) / len(QUERIES),
+    }
+
+
+def main(backends):
+    print(f"{'backend':<24}{'ms/snippet':>12}{'ms/query':>10}{'recall@1':>10}{'MRR':>8}")
+    for backend in backends:
+        try:
+            embed, _ = build_embedding_function(backend)
+            row = evaluate(embed)
+        except ConfigurationError as e:
+            print(f"{backend:<24}skipped: {str(e).splitlines()[0]}")
+            continue
+        print(f"{backend:<24}{row['ms_per_snippet']:>12.2f}{row['ms_per_query']:>10.2f}"
+              f"{row['recall_at_1']:>10.0%}{row['mrr']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(EMBEDDING_BACKENDS))
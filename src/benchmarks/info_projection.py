@@ -0,0 +1,56 @@
+"""
+Measure how much prompt the financial analyst's get_stock_info call costs.
+
+Compares the old payload (summary fields plus the raw 'full_info' dict) with the
+projected payload the tool returns now.
+
+Usage (from src/):
+    python -m benchmarks.info_projection AAPL MSFT TSLA
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.financial_tools import get_stock_info
+from tools.market_data import load_info
+from tools.projection import estimate_tokens, payload_size
+
+
+def measure(ticker: str) -> dict:
+    """Return byte and token counts of the legacy and projected payloads for one ticker."""
+    projected = get_stock_info.run(ticker)
+    legacy = {k: v for k, v in projected.items() if k not in ('omitted_fields', 'more_fields_available')}
+    legacy['full_info'] = load_info(ticker)
+
+    return {
+        'ticker': ticker,
+        'legacy_bytes': payload_size(legacy),
+        'legacy_tokens': estimate_tokens(legacy),
+        'projected_bytes': payload_size(projected),
+        'projected_tokens': estimate_tokens(projected),
+    }
+
+
+def main(tickers):
+    print(f"{'ticker':<8}{'legacy bytes':>14}{'legacy tok':>12}{'new bytes':>12}{'new tok':>10}{'saved':>8}")
+    total_legacy = total_projected = 0
+    for ticker in tickers:
+        row = measure(ticker.strip().upper())
+        total_legacy += row['legacy_tokens']
+        total_projected += row['projected_tokens']
+        saved = 1 - row['projected_tokens'] / row['legacy_tokens']
+        print(
+            f"{row['ticker']:<8}{row['legacy_bytes']:>14}{row['legacy_tokens']:>12}"
+            f"{row['projected_bytes']:>12}{row['projected_tokens']:>10}{saved:>8.0%}"
+        )
+
+    if total_legacy:
+        print(f"\nTotal tokens per analyst run: {total_legacy} -> {total_projected} "
+              f"({1 - total_projected / total_legacy:.0%} fewer)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["AAPL", "MSFT", "TSLA"])
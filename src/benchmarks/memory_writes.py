@@ -0,0 +1,67 @@
+"""
+Measure memory write throughput: one save_context call per finding versus batched writes.
+
+Each single write costs its own embedding request and Chroma write; save_many
+embeds and writes the whole batch at once. Runs against a throwaway
+collection, which is deleted afterwards.
+
+Usage (from src/):
+    python -m benchmarks.memory_writes 64
+"""
+
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.memory_store import FinancialMemory
+
+BENCHMARK_COLLECTION = "benchmark_memory_writes"
+
+
+def make_findings(count: int, label: str) -> list:
+    """Synthetic findings shaped like what the agents save (distinct per label, since stored content is skipped)."""
+    return [
+        (f"{label} finding {i}: quarterly revenue for TICK{i % 7} grew {i % 13 + 1}% year over year "
+         f"while operating margin moved {i % 5 - 2} points.", {"source": "benchmark"})
+        for i in range(count)
+    ]
+
+
+def time_single(memory: FinancialMemory, findings: list) -> float:
+    started = time.perf_counter()
+    for text, metadata in findings:
+        memory.save_context(text, metadata)
+    return time.perf_counter() - started
+
+
+def time_batched(memory: FinancialMemory, findings: list) -> float:
+    started = time.perf_counter()
+    for text, metadata in findings:
+        memory.buffer_context(text, metadata)
+    memory.flush()
+    return time.perf_counter() - started
+
+
+def main(count: int):
+    memory = FinancialMemory(collection_name=BENCHMARK_COLLECTION)
+    run = int(time.time())
+
+    try:
+        single = time_single(memory, make_findings(count, f"single-{run}"))
+        batched = time_batched(memory, make_findings(count, f"batched-{run}"))
+    finally:
+        memory.client.delete_collection(memory.collection_name)
+
+    batches = -(-count // memory.batch_size)
+    print(f"\n{'mode':<10}{'seconds':>10}{'findings/s':>12}{'writes':>8}")
+    print(f"{'single':<10}{single:>10.2f}{count / single:>12.1f}{count:>8}")
+    print(f"{'batched':<10}{batched:>10.2f}{count / batched:>12.1f}{batches:>8}")
+    print(f"\nBatched writes are {single / batched:.1f}x faster "
+          f"({count} findings, batch size {memory.batch_size})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
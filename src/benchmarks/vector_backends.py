@@ -0,0 +1,112 @@
+"""
+Compare vector store backends on write time, search latency and recall.
+
+Synthetic findings are embedded once with the local hashing embedder, so
+only the stores are timed: Chroma (persistent, in a temporary directory),
+the NumPy matrix with exact search, and the NumPy matrix with an IVF index.
+Recall@k is measured against exact brute-force search, for plain and
+ticker-filtered queries.
+
+Usage (from src/):
+    python -m benchmarks.vector_backends
+    python -m benchmarks.vector_backends 300 5000
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.embeddings import HashingEmbeddingFunction
+from tools.vector_backends import ChromaBackend, NumpyBackend
+
+TICKERS = ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'AMZN', 'META', 'GOOGL', 'JPM']
+TOPICS = ['revenue', 'operating margin', 'guidance', 'buyback', 'debt', 'capex', 'recall', 'lawsuit', 'dividend']
+QUERIES = 100
+TOP_K = 5
+WRITE_BATCH = 1000
+
+
+def make_findings(count: int) -> tuple:
+    """Findings shaped like what the agents save, with ticker metadata."""
+    rng = np.random.default_rng(7)
+    texts, metadatas = [], []
+    for i in range(count):
+        ticker = TICKERS[i % len(TICKERS)]
+        topic, other = rng.choice(TOPICS, 2, replace=False)
+        texts.append(f"{ticker} {topic} moved {rng.integers(1, 40)}% in Q{i % 4 + 1} "
+                     f"while {other} was {rng.choice(['flat', 'up', 'down'])} (finding {i}).")
+        metadatas.append({'ticker': ticker, 'metric_type': 'news' if i % 3 == 0 else 'fundamentals'})
+    return texts, metadatas
+
+
+def exact_top_k(documents: np.ndarray, metadatas: list, queries: np.ndarray, where: dict) -> list:
+    allowed = np.array([i for i, m in enumerate(metadatas) if not where or m['ticker'] == where['ticker']])
+    scores = queries @ documents[allowed].T
+    return [set(allowed[np.argsort(-row)[:TOP_K]].tolist()) for row in scores]
+
+
+def run(backend, texts, metadatas, documents, queries, filters, truth) -> dict:
+    collection = backend.get_or_create_collection('benchmark_vectors')
+    ids = [str(i) for i in range(len(texts))]
+
+    started = time.perf_counter()
+    for start in range(0, len(ids), WRITE_BATCH):
+        end = start + WRITE_BATCH
+        collection.upsert(ids=ids[start:end], documents=texts[start:end],
+                          metadatas=metadatas[start:end], embeddings=documents[start:end])
+    write_time = time.perf_counter() - started
+
+    # Warm up (loads the index / trains IVF) outside the timed loop
+    collection.query(query_embeddings=queries[:1], n_results=TOP_K)
+
+    hits, latencies = 0, []
+    for vector, where, expected in zip(queries, filters, truth):
+        started = time.perf_counter()
+        result = collection.query(query_embeddings=[vector], n_results=TOP_K, where=where, include=[])
+        latencies.append(time.perf_counter() - started)
+        hits += len(expected & {int(i) for i in result['ids'][0]})
+
+    return {
+        'write_ms': 1000 * write_time,
+        'query_ms': 1000 * float(np.mean(latencies)),
+        'p95_ms': 1000 * float(np.percentile(latencies, 95)),
+        'recall': hits / (TOP_K * len(truth)),
+    }
+
+
+def main(sizes):
+    embed = HashingEmbeddingFunction()
+    print(f"{'findings':>9}  {'backend':<12}{'write ms':>10}{'query ms':>10}{'p95 ms':>9}{'recall@5':>10}")
+    for size in sizes:
+        texts, metadatas = make_findings(size)
+        documents = np.asarray(embed(texts), dtype=np.float32)
+        query_texts, _ = make_findings(QUERIES)
+        queries = np.asarray(embed(query_texts), dtype=np.float32)
+        # Half the queries are scoped to a ticker, like the agents' searches
+        filters = [{'ticker': TICKERS[i % len(TICKERS)]} if i % 2 else None for i in range(QUERIES)]
+        truth = [exact_top_k(documents, metadatas, queries[i:i + 1], filters[i])[0] for i in range(QUERIES)]
+
+        chroma_path = tempfile.mkdtemp(prefix='benchmark_chroma_')
+        backends = {
+            'chroma': lambda: ChromaBackend(chroma_path),
+            'numpy-flat': lambda: NumpyBackend(index='flat'),
+            'numpy-ivf': lambda: NumpyBackend(index='ivf'),
+        }
+        try:
+            for name, make in backends.items():
+                row = run(make(), texts, metadatas, documents, queries, filters, truth)
+                print(f"{size:>9}  {name:<12}{row['write_ms']:>10.1f}{row['query_ms']:>10.3f}"
+                      f"{row['p95_ms']:>9.3f}{row['recall']:>10.0%}")
+        finally:
+            shutil.rmtree(chroma_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [300, 3000])
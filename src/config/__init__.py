@@ -1,3 +1,3 @@
-from .settings import get_config, validate_config
+from .settings import get_config, get_cache_config, get_http_config, get_memory_config, get_provider_config, get_replay_config, get_tool_config, validate_config
 
-__all__ = ['get_config', 'validate_config']
+__all__ = ['get_config', 'get_cache_config', 'get_http_config', 'get_memory_config', 'get_provider_config', 'get_replay_config', 'get_tool_config', 'validate_config']
@@ -48,6 +48,172 @@ def get_config() -> Dict[str, Any]:
     return config
 
 
+def get_cache_config() -> Dict[str, Any]:
+    """
+    Load market data cache settings from environment variables.
+
+    Unlike get_config(), nothing here is required; every setting has a default.
+
+    Returns:
+        Dictionary containing the cache location and per-kind freshness (seconds)
+    """
+    config = {
+        'cache_path': os.getenv('MARKET_CACHE_PATH', './internal_cache_db/market_data.sqlite3'),
+        'quote_ttl': int(os.getenv('MARKET_CACHE_QUOTE_TTL', '60')),
+        'info_ttl': int(os.getenv('MARKET_CACHE_INFO_TTL', '86400')),
+        'name_ttl': int(os.getenv('MARKET_CACHE_NAME_TTL', str(30 * 86400))),
+        'history_ttl': int(os.getenv('MARKET_CACHE_HISTORY_TTL', str(6 * 3600))),
+        'search_ttl': int(os.getenv('MARKET_CACHE_SEARCH_TTL', '900')),
+
+        # Local daily price history store
+        'price_store_path': os.getenv('PRICE_STORE_PATH', './internal_price_db'),
+        'price_store_initial_period': os.getenv('PRICE_STORE_INITIAL_PERIOD', '5y'),
+    }
+
+    return config
+
+
+def get_http_config() -> Dict[str, Any]:
+    """
+    Load HTTP client settings for the data providers from environment variables.
+
+    Returns:
+        Dictionary containing the request timeout (seconds), the connection pool
+        size, the maximum number of concurrent requests per provider, and the
+        rate limit and retry policy shared by all tools
+    """
+    config = {
+        'timeout': float(os.getenv('HTTP_TIMEOUT', '15')),
+        'pool_size': int(os.getenv('HTTP_POOL_SIZE', '10')),
+        'max_concurrency': {
+            'yfinance': int(os.getenv('YFINANCE_MAX_CONCURRENCY', '4')),
+            'tavily': int(os.getenv('TAVILY_MAX_CONCURRENCY', '4')),
+        },
+
+        # Token-bucket rate limits (requests per second, burst size) per provider
+        'rate_limits': {
+            'yfinance': {
+                'rate': float(os.getenv('YFINANCE_RATE_LIMIT', '2')),
+                'burst': int(os.getenv('YFINANCE_BURST', '5')),
+            },
+            'tavily': {
+                'rate': float(os.getenv('TAVILY_RATE_LIMIT', '1')),
+                'burst': int(os.getenv('TAVILY_BURST', '3')),
+            },
+        },
+
+        # Retries of throttled/transient failures: jittered exponential backoff,
+        # capped by a process-wide budget of retries per minute per provider
+        'max_retries': int(os.getenv('PROVIDER_MAX_RETRIES', '4')),
+        'backoff_base': float(os.getenv('PROVIDER_BACKOFF_BASE', '0.5')),
+        'backoff_max': float(os.getenv('PROVIDER_BACKOFF_MAX', '8')),
+        'retry_budget': int(os.getenv('PROVIDER_RETRY_BUDGET', '30')),
+    }
+
+    return config
+
+
+def get_provider_config() -> Dict[str, Any]:
+    """
+    Load market data provider settings from environment variables.
+
+    Returns:
+        Dictionary containing the provider tiers (fastest first), the timeout
+        after which a tier is skipped, the local snapshot location and the
+        optional Financial Datasets API key
+    """
+    providers = os.getenv('MARKET_DATA_PROVIDERS', 'snapshot,yfinance')
+
+    config = {
+        'providers': [p.strip().lower() for p in providers.split(',') if p.strip()],
+        'provider_timeout': float(os.getenv('MARKET_DATA_PROVIDER_TIMEOUT', '5')),
+        'snapshot_path': os.getenv('MARKET_SNAPSHOT_PATH', './internal_snapshot'),
+        'financial_datasets_api_key': os.getenv('FINANCIAL_DATASETS_API_KEY'),
+    }
+
+    return config
+
+
+def get_replay_config() -> Dict[str, Any]:
+    """
+    Load record/replay settings for data provider responses from environment variables.
+
+    Returns:
+        Dictionary containing the replay mode ('off', 'record' or 'replay'),
+        the fixture directory and whether replay keeps the original latency
+    """
+    config = {
+        'replay_mode': os.getenv('REPLAY_MODE', 'off'),
+        'fixture_path': os.getenv('REPLAY_FIXTURE_PATH', './fixtures'),
+        'replay_latency': os.getenv('REPLAY_LATENCY', 'original'),
+    }
+
+    return config
+
+
+def get_tool_config() -> Dict[str, Any]:
+    """
+    Load agent tool output settings from environment variables.
+
+    Returns:
+        Dictionary containing limits applied to what tools send back to the LLM
+    """
+    config = {
+        # Upper bound on the serialised size of get_stock_info's answer
+        'info_max_bytes': int(os.getenv('TOOL_INFO_MAX_BYTES', '2048')),
+
+        # Inputs of the risk metrics engine
+        'risk_benchmark': os.getenv('RISK_BENCHMARK', '^GSPC'),
+        'risk_free_rate': float(os.getenv('RISK_FREE_RATE', '0.04')),
+    }
+
+    return config
+
+
+def get_memory_config() -> Dict[str, Any]:
+    """
+    Load vector memory settings from environment variables.
+
+    Returns:
+        Dictionary containing the write buffer limits (findings are written
+        once `write_batch_size` are buffered or `write_flush_interval` seconds
+        after the first one, whichever comes first), the partitioning and
+        retention policy, the vector store backend, and the embedding
+        backend, model and cache settings
+    """
+    config = {
+        'write_batch_size': int(os.getenv('MEMORY_WRITE_BATCH_SIZE', '32')),
+        # Well above one LLM turn (several seconds), so the saves of consecutive turns
+        # share a write; searches and process exit flush the buffer anyway
+        'write_flush_interval': float(os.getenv('MEMORY_WRITE_FLUSH_INTERVAL', '45')),
+
+        # 'ticker' keeps one collection per ticker; 'none' keeps everything in one collection
+        'partition_by': os.getenv('MEMORY_PARTITION_BY', 'ticker'),
+        # Retention: news goes stale fast, other findings are kept longer (0 keeps forever)
+        'news_retention_days': float(os.getenv('MEMORY_NEWS_RETENTION_DAYS', '30')),
+        'retention_days': float(os.getenv('MEMORY_RETENTION_DAYS', '365')),
+        # Most partitions a search without a ticker looks into
+        'search_partition_limit': int(os.getenv('MEMORY_SEARCH_PARTITION_LIMIT', '20')),
+
+        # 'chroma' (persistent) or 'numpy' (in-process matrix, saved to vector_path if set)
+        'vector_backend': os.getenv('MEMORY_VECTOR_BACKEND', 'chroma'),
+        'vector_path': os.getenv('MEMORY_VECTOR_PATH', ''),
+        # NumPy search: 'flat' (exact) or 'ivf' (clustered, probes the nearest ivf_probes lists)
+        'vector_index': os.getenv('MEMORY_VECTOR_INDEX', 'flat'),
+        'ivf_probes': int(os.getenv('MEMORY_IVF_PROBES', '4')),
+
+        # 'openai', 'hashing' (local, no key needed) or 'sentence-transformers' (local, optional package)
+        'embedding_backend': os.getenv('EMBEDDING_BACKEND', 'openai'),
+        'embedding_model': os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small'),
+        'local_embedding_model': os.getenv('LOCAL_EMBEDDING_MODEL', 'all-MiniLM-L6-v2'),
+        'hashing_dim': int(os.getenv('HASHING_EMBEDDING_DIM', '512')),
+        'embedding_cache_path': os.getenv('EMBEDDING_CACHE_PATH', './internal_cache_db/embeddings.sqlite3'),
+        'embedding_cache_size': int(os.getenv('EMBEDDING_CACHE_SIZE', '100000')),
+    }
+
+    return config
+
+
 def validate_config() -> bool:
     """
     Validate that all required configuration is present.
@@ -1,7 +1,32 @@
-from .financial_tools import get_stock_price, get_stock_info
+from .financial_tools import (
+    get_stock_price,
+    get_stock_info,
+    get_stock_overview,
+    get_more_stock_fields,
+    get_fundamental_ratios,
+    get_price_history,
+    get_risk_metrics,
+    compare_stocks,
+    get_market_data,
+)
+from .market_data import load_quotes, load_infos
 from .memory_tools import MemoryTools
+from .async_tools import aget_stock_price, aget_stock_info, aget_market_data, agather_stock_data
 
 __all__ = [
     'get_stock_price',
     'get_stock_info',
+    'get_stock_overview',
+    'get_more_stock_fields',
+    'get_fundamental_ratios',
+    'get_price_history',
+    'get_risk_metrics',
+    'compare_stocks',
+    'get_market_data',
+    'load_quotes',
+    'load_infos',
+    'aget_stock_price',
+    'aget_stock_info',
+    'aget_market_data',
+    'agather_stock_data',
 ]
\ No newline at end of file
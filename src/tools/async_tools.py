@@ -0,0 +1,88 @@
+"""Asyncio-native variants of the data and memory tools, for gathering lookups concurrently."""
+
+import asyncio
+from typing import Any, Dict
+
+from .financial_tools import (
+    get_fundamental_ratios,
+    get_market_data,
+    get_stock_info,
+    get_stock_price,
+)
+from .market_data import aload_stock_bundle
+from .memory_store import build_where, finding_metadata
+from .memory_tools import get_memory_db
+
+
+# The data providers are blocking client libraries (yfinance, requests,
+# chromadb), so each coroutine runs the synchronous tool body on a worker
+# thread. Rate limits, caching and request coalescing still apply because
+# the same code path is used.
+
+async def aget_stock_price(ticker: str) -> str:
+    """Async variant of the Get Stock Price tool."""
+    return await asyncio.to_thread(get_stock_price.func, ticker)
+
+
+async def aget_stock_info(ticker: str, fields: str = "") -> Any:
+    """Async variant of the Get Stock Info tool."""
+    return await asyncio.to_thread(get_stock_info.func, ticker, fields)
+
+
+async def aget_fundamental_ratios(ticker: str) -> Any:
+    """Async variant of the Get Fundamental Ratios tool."""
+    return await asyncio.to_thread(get_fundamental_ratios.func, ticker)
+
+
+async def aget_market_data(ticker: str) -> str:
+    """Async variant of the Get Market Data tool."""
+    return await asyncio.to_thread(get_market_data.func, ticker)
+
+
+async def asave_finding(content: str, source: str) -> str:
+    """Async variant of the Save Finding to Memory tool."""
+    # The first call opens the memory, which blocks, so it runs on the worker thread too
+    await asyncio.to_thread(lambda: get_memory_db().buffer_context(content, finding_metadata(source)))
+    return "Finding successfully saved to long-term memory."
+
+
+async def asearch_memory(query: str, ticker: str = "") -> str:
+    """Async variant of the Query Shared Memory tool."""
+    memory = await asyncio.to_thread(get_memory_db)
+    results = await memory.aquery_memory(query, where=build_where(ticker=ticker or None))
+    if not results:
+        return "No relevant information found in memory."
+    return f"Here is what I found in memory:\n{results}"
+
+
+async def agather_stock_data(ticker: str) -> Dict[str, Any]:
+    """
+    Fetch everything an analyst step needs about a ticker concurrently.
+
+    Price, info and statements come from aload_stock_bundle(); the web market
+    data is searched at the same time.
+
+    Args:
+        ticker: A stock ticker symbol
+
+    Returns:
+        {'quote', 'info', 'statements', 'market_data'}; a part that failed holds the exception
+    """
+    ticker = ticker.strip().upper()
+    bundle, market_data = await asyncio.gather(
+        aload_stock_bundle(ticker),
+        aget_market_data(ticker),
+        return_exceptions=True,
+    )
+    if isinstance(bundle, Exception):
+        bundle = {'quote': bundle, 'info': bundle, 'statements': bundle}
+    return dict(bundle, market_data=market_data)
+
+
+if __name__ == "__main__":
+    async def _demo():
+        price, info = await asyncio.gather(aget_stock_price("AAPL"), aget_stock_info("AAPL"))
+        print(price)
+        print(info)
+
+    asyncio.run(_demo())
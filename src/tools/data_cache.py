@@ -0,0 +1,200 @@
+"""Persistent TTL cache for market data lookups shared across runs and agents."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import get_cache_config
+from .single_flight import SingleFlight
+
+
+class DataCache:
+    """
+    SQLite-backed cache keyed by (ticker, kind).
+
+    Each kind of data has its own freshness rule: a quote is only good for about
+    a minute, while company fundamentals barely change during a day. Entries older
+    than their TTL are treated as stale and refetched by get_or_fetch().
+    """
+
+    def __init__(self, path: str = None, ttls: Dict[str, int] = None):
+        """
+        Args:
+            path: SQLite file location (defaults to MARKET_CACHE_PATH)
+            ttls: Optional overrides of the per-kind freshness, in seconds
+        """
+        config = get_cache_config()
+        self.path = path or config['cache_path']
+        self.ttls = {
+            'quote': config['quote_ttl'],
+            'info': config['info_ttl'],
+            'name': config['name_ttl'],
+            'statements': config['info_ttl'],
+            'search': config['search_ttl'],
+        }
+        if ttls:
+            self.ttls.update(ttls)
+
+        # The connection is opened on first use so importing the tools stays cheap
+        self._conn = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'writes': 0}
+        self.flights = SingleFlight()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS market_data ("
+                " ticker TEXT NOT NULL,"
+                " kind TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (ticker, kind))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def ttl_for(self, kind: str) -> int:
+        """Freshness of a kind of data in seconds (unknown kinds use the fundamentals TTL)."""
+        return self.ttls.get(kind, self.ttls['info'])
+
+    def _read(self, ticker: str, kind: str):
+        """Look up an entry; returns (value, state) with state 'hit', 'miss' or 'stale'."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT payload, fetched_at FROM market_data WHERE ticker = ? AND kind = ?",
+                (ticker, kind),
+            ).fetchone()
+
+        if row is None:
+            return None, 'miss'
+
+        payload, fetched_at = row
+        if time.time() - fetched_at > self.ttl_for(kind):
+            return None, 'stale'
+
+        return json.loads(payload), 'hit'
+
+    def get(self, ticker: str, kind: str) -> Optional[Any]:
+        """
+        Return the cached value if it is still fresh.
+
+        Args:
+            ticker: Stock ticker symbol
+            kind: Data kind (e.g. 'quote', 'info')
+
+        Returns:
+            The cached value, or None when missing or stale
+        """
+        value, state = self._read(ticker, kind)
+        with self._lock:
+            self._stats[{'hit': 'hits', 'miss': 'misses', 'stale': 'stale'}[state]] += 1
+        return value
+
+    def peek(self, ticker: str, kind: str) -> Optional[Any]:
+        """
+        Return the cached value whatever its age, without touching the counters.
+
+        Useful to merge a stale entry with a fresh fetch.
+
+        Args:
+            ticker: Stock ticker symbol
+            kind: Data kind (e.g. 'quote', 'info')
+
+        Returns:
+            The cached value, or None when missing
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT payload FROM market_data WHERE ticker = ? AND kind = ?",
+                (ticker, kind),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, ticker: str, kind: str, value: Any):
+        """
+        Store a value, replacing any previous entry for the same key.
+
+        Args:
+            ticker: Stock ticker symbol
+            kind: Data kind (e.g. 'quote', 'info')
+            value: JSON-serialisable value
+        """
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO market_data (ticker, kind, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (ticker, kind, payload, time.time()),
+            )
+            conn.commit()
+            self._stats['writes'] += 1
+
+    def get_or_fetch(self, ticker: str, kind: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached value, calling fetch() and caching its result on a miss.
+
+        Concurrent callers missing on the same key wait for a single fetch and
+        share its result instead of all hitting the provider.
+
+        Args:
+            ticker: Stock ticker symbol
+            kind: Data kind (e.g. 'quote', 'info')
+            fetch: Zero-argument callable that loads the value from the provider
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.get(ticker, kind)
+        if value is not None:
+            return value
+
+        def _load():
+            # A previous leader may have filled the entry while we were looking it up
+            value, state = self._read(ticker, kind)
+            if state == 'hit':
+                return value
+
+            value = fetch()
+            if value:
+                self.set(ticker, kind, value)
+            return value
+
+        # COALESCING: Concurrent misses for the same key share one upstream fetch
+        return self.flights.do((ticker, kind), _load)
+
+    def invalidate(self, ticker: str, kind: str = None):
+        """Drop cached entries for a ticker (all kinds unless one is given)."""
+        with self._lock:
+            conn = self._connect()
+            if kind is None:
+                conn.execute("DELETE FROM market_data WHERE ticker = ?", (ticker,))
+            else:
+                conn.execute("DELETE FROM market_data WHERE ticker = ? AND kind = ?", (ticker, kind))
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss/staleness counters since the cache was created.
+
+        Returns:
+            Dictionary with the raw counters, the number of fetches that joined an
+            in-flight fetch ('coalesced') and the overall hit rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['coalesced'] = self.flights.stats()['coalesced']
+        lookups = stats['hits'] + stats['misses'] + stats['stale']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# Shared by every tool in the process so agents reuse each other's lookups
+market_cache = DataCache()
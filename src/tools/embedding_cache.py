@@ -0,0 +1,147 @@
+"""Persistent embedding cache so repeated documents and queries are embedded only once."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from chromadb import EmbeddingFunction
+
+
+class CachedEmbeddingFunction(EmbeddingFunction):
+    """
+    Chroma embedding function that remembers every embedding it has computed.
+
+    Embeddings are stored in SQLite keyed by (model, sha256(text)), so they
+    survive restarts. Only texts missing from the cache are sent to the wrapped
+    embedding function, in a single request per call. Beyond `max_entries` the
+    least recently used embeddings are evicted.
+    """
+
+    def __init__(self, inner: EmbeddingFunction, model: str, path: str, max_entries: int = 100000):
+        """
+        Args:
+            inner: The embedding function doing the actual work (e.g. OpenAI's)
+            model: Model name, part of the cache key so switching models never mixes vectors
+            path: SQLite file location
+            max_entries: Upper bound on cached embeddings (LRU eviction)
+        """
+        self.inner = inner
+        self.model = model
+        self.path = path
+        self.max_entries = max_entries
+
+        # The connection is opened on first use so importing the tools stays cheap
+        self._conn = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'requests': 0, 'evicted': 0}
+
+    # Chroma asks embedding functions to describe themselves (and checks the
+    # description against the persisted collection); answer as the wrapped one
+
+    def name(self) -> str:
+        return self.inner.name()
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.inner.get_config()
+
+    def is_legacy(self) -> bool:
+        return self.inner.is_legacy()
+
+    def default_space(self):
+        return self.inner.default_space()
+
+    def supported_spaces(self):
+        return self.inner.supported_spaces()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " model TEXT NOT NULL,"
+                " text_hash TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " used_at REAL NOT NULL,"
+                " PRIMARY KEY (model, text_hash))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_used_at ON embeddings (used_at)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        hashes = [self.text_hash(text) for text in input]
+        unique = list(dict.fromkeys(hashes))
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            found = {}
+            # SQLite caps the number of bound parameters, so look up in slices
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [self.model, *chunk],
+                ).fetchall()
+                found.update({h: np.frombuffer(blob, dtype=np.float32) for h, blob in rows})
+
+            if found:
+                conn.executemany(
+                    "UPDATE embeddings SET used_at = ? WHERE model = ? AND text_hash = ?",
+                    [(now, self.model, h) for h in found],
+                )
+                conn.commit()
+
+        missing = [h for h in unique if h not in found]
+        if missing:
+            texts = {h: text for h, text in zip(hashes, input)}
+            vectors = self.inner([texts[h] for h in missing])
+            computed = {h: np.asarray(v, dtype=np.float32) for h, v in zip(missing, vectors)}
+            found.update(computed)
+            self._store(computed, now)
+
+        with self._lock:
+            self._stats['hits'] += len(hashes) - len(missing)
+            self._stats['misses'] += len(missing)
+            self._stats['requests'] += 1 if missing else 0
+
+        return [found[h].tolist() for h in hashes]
+
+    def _store(self, vectors: Dict[str, np.ndarray], now: float):
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, used_at) VALUES (?, ?, ?, ?)",
+                [(self.model, h, v.tobytes(), now) for h, v in vectors.items()],
+            )
+
+            # EVICTION: Drop the least recently used embeddings beyond the size limit
+            excess = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY used_at LIMIT ?)",
+                    (excess,),
+                )
+                self._stats['evicted'] += excess
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters: texts served from the cache, texts embedded, embedding requests made."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
@@ -0,0 +1,129 @@
+"""Embedding backends for the vector memory: OpenAI, or local CPU-only models that need no key."""
+
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from chromadb import EmbeddingFunction
+from chromadb.utils import embedding_functions
+
+from config.settings import ConfigurationError, get_memory_config
+
+# Backends accepted by EMBEDDING_BACKEND
+EMBEDDING_BACKENDS = ('openai', 'hashing', 'sentence-transformers')
+
+# Character n-gram sizes used by the hashing embedder (besides words and word pairs)
+CHAR_NGRAMS = (3, 4, 5)
+
+# Char n-grams are many and noisy, so each counts less than a whole word
+CHAR_NGRAM_WEIGHT = 0.4
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9$%.&'-]*")
+
+
+class HashingEmbeddingFunction(EmbeddingFunction):
+    """
+    Deterministic local embedder: hashed word, word-pair and character n-gram features.
+
+    Each feature is hashed into one of `dim` signed buckets (the hashing trick)
+    with a sublinear term-frequency weight, and every vector is L2-normalised
+    so cosine similarity behaves like TF-IDF-style lexical overlap. No model
+    download, no network, and microseconds per snippet, which suits short
+    financial snippets where shared tickers, figures and terms dominate.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    @staticmethod
+    def name() -> str:
+        return "finresearch_hashing"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {'dim': self.dim}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "HashingEmbeddingFunction":
+        return HashingEmbeddingFunction(dim=config.get('dim', 512))
+
+    @staticmethod
+    def features(text: str) -> Counter:
+        """Weighted features of a text: words, adjacent word pairs and character n-grams."""
+        words = _WORD.findall(text.lower())
+        features = Counter(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f" {word} "
+            for n in CHAR_NGRAMS:
+                for i in range(len(padded) - n + 1):
+                    features[f"#{padded[i:i + n]}"] += CHAR_NGRAM_WEIGHT
+        return features
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        matrix = np.zeros((len(input), self.dim), dtype=np.float32)
+        for row, text in enumerate(input):
+            for feature, count in self.features(text).items():
+                digest = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+                sign = 1.0 if digest >> 63 else -1.0
+                matrix[row, digest % self.dim] += sign * (1.0 + math.log1p(count))
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+        return matrix.tolist()
+
+
+def build_embedding_function(backend: str = None) -> Tuple[EmbeddingFunction, str]:
+    """
+    Create the embedding function selected by EMBEDDING_BACKEND.
+
+    - 'openai': OpenAI's API (EMBEDDING_MODEL, needs OPENAI_API_KEY)
+    - 'hashing': the local hashed n-gram embedder, no dependencies
+    - 'sentence-transformers': a small local transformer (LOCAL_EMBEDDING_MODEL),
+      requires the optional sentence-transformers package
+
+    Args:
+        backend: Override of the configured backend
+
+    Returns:
+        (embedding function, model name used to key cached embeddings)
+    """
+    config = get_memory_config()
+    backend = (backend or config['embedding_backend']).lower()
+
+    if backend == 'openai':
+        openai_api_key = os.getenv('OPENAI_API_KEY')
+        if not openai_api_key:
+            raise ConfigurationError(
+                "OPENAI_API_KEY not found. Set it in your .env file, or set "
+                "EMBEDDING_BACKEND=hashing to run the memory without OpenAI."
+            )
+        function = embedding_functions.OpenAIEmbeddingFunction(
+            api_key=openai_api_key,
+            model_name=config['embedding_model'],
+        )
+        return function, config['embedding_model']
+
+    if backend == 'hashing':
+        function = HashingEmbeddingFunction(dim=config['hashing_dim'])
+        return function, f"hashing-{config['hashing_dim']}"
+
+    if backend == 'sentence-transformers':
+        try:
+            function = embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=config['local_embedding_model'],
+                device='cpu',
+            )
+        except (ImportError, ValueError) as e:
+            raise ConfigurationError(
+                "EMBEDDING_BACKEND=sentence-transformers requires the sentence-transformers "
+                f"package (pip install sentence-transformers): {e}"
+            )
+        return function, config['local_embedding_model']
+
+    raise ConfigurationError(
+        f"Unknown EMBEDDING_BACKEND '{backend}'. Choose from: {', '.join(EMBEDDING_BACKENDS)}"
+    )
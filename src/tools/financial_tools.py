@@ -1,7 +1,15 @@
 from crewai.tools import tool
-from config.settings import get_config
-import yfinance as yf
-from tavily import TavilyClient
+from config.settings import get_tool_config
+from .quote_engine import quote_engine
+from .web_search import search_cache
+from .market_data import (
+    aload_stock_bundle, load_history, load_info, load_infos, load_quotes, load_statements,
+    normalize_tickers, run_coroutine,
+)
+from .fundamentals import compute_fundamentals, statement_to_dict
+from .projection import project_fields
+from .rate_limiter import ProviderThrottledError
+from .risk_metrics import align_series, compute_risk_metrics
 
 def roundNumericalString(value: str, ndigits: int) -> str:
     result = 'N/A'
@@ -31,61 +39,47 @@ def get_stock_price(ticker: str) -> str:
     try:
         # DEFENSIVE CODING: Clean the input to handle common formatting issues
         ticker = ticker.strip().upper()
-        
-        stock = yf.Ticker(ticker)
-        history = stock.history(period="1d")
-        
+
+        # FAST PATH: One fast_info request; the name comes from the local name table
+        quote = quote_engine.get_quote(ticker)
+
         # EDGE CASE: Handle empty data (invalid ticker or market closed)
-        if history.empty:
+        if quote is None:
             return f"No data available for ticker '{ticker}'. Please verify the ticker symbol is correct."
+
+        return f"The current price of {quote['name']} ({ticker}) is ${quote['price']:.2f} USD"
         
-        price = history['Close'].iloc[-1]
-        #print(f"stock price of {ticker}" + "\n")        
-        print(price)
-        #print(f"stock price of {ticker}" + "\n")
-    
-        
-        # CONTEXT ENRICHMENT: Return additional useful information
-        company_name = stock.info.get('shortName', ticker)
-        return f"The current price of {company_name} ({ticker}) is ${price:.2f} USD"
-        
+    except ProviderThrottledError:
+        # Retries already happened in the rate limiter; retrying from the LLM only adds load
+        return f"Yahoo Finance is rate limiting requests, so the price for '{ticker}' is unavailable right now. Do not retry; mark it as 'N/A'."
     except Exception as e:
         # GRACEFUL DEGRADATION: Return useful error info instead of crashing
         return f"Error fetching price for '{ticker}': {str(e)}. Please check the ticker symbol."
 
 
 @tool("Get Stock Info")
-def get_stock_info(ticker: str) -> str:
+def get_stock_info(ticker: str, fields: str = "") -> str:
     """
     Fetches detailed company information for a given ticker symbol.
     
     Use this tool when you need background information about a company,
-    such as sector, industry, market cap, or business description.
+    such as sector, industry, market cap, or key financial ratios.
     Input should be a valid stock ticker symbol (e.g., 'AAPL').
+    The answer is kept compact; use the Get More Stock Fields tool for anything else.
     
     Args:
         ticker: A stock ticker symbol
+        fields: Optional comma-separated subset of the summary fields to return
     
     Returns:
         A string with company details or an error message
     """
     try:
         ticker = ticker.strip().upper()
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        #print(f"stock info of {ticker}"  + "\n")        
-        #print(info)        
-        #print(f"stock info of {ticker}" + "\n")
-
-      
-        # Extract and round P/E ratio to 2 decimal places
-        """    trailing_pe = info.get('trailingPE')
-        if trailing_pe is not None and isinstance(trailing_pe, (int, float)):
-            trailing_pe = round(trailing_pe, 2)
-        else:
-            trailing_pe = 'N/A'
-        print(f"trailing_pe: ${trailing_pe}")    """     
-        
+
+        # CACHING: Fundamentals stay fresh for a day, so reuse them across runs
+        info = load_info(ticker)
+
         # BUILD A STRUCTURED RESPONSE
         # We return key metrics that would be useful for a financial analyst
         # Ensure critical metrics are included
@@ -99,15 +93,15 @@ def get_stock_info(ticker: str) -> str:
             '52-week_range': info.get('fiftyTwoWeekRange', 0),
                     
             # Valuation metrics
-            'pe_ratio': f"{info.get('trailingPE', 'N/A'):.2f}",
-            #'pe_ratio': roundNumericalString(info.get('trailingPE')),
-            #'peg_ratio': roundNumericalString(info.get('trailingPegRatio', 2)),
-            'peg_ratio': f"{info.get('trailingPegRatio', 'N/A'):.2f}",
-            'debt_to_equity': f"{info.get('debtToEquity', 'N/A'):.2f}",
+            'pe_ratio': roundNumericalString(info.get('trailingPE'), 2),
+            'peg_ratio': roundNumericalString(info.get('trailingPegRatio'), 2),
+            # Yahoo reports debt-to-equity as a percentage; return a ratio like fundamentals does
+            'debt_to_equity': roundNumericalString(
+                info['debtToEquity'] / 100 if isinstance(info.get('debtToEquity'), (int, float)) else None, 2),
             
             # Profitability metrics - CRITICAL
-            'roe': f"{info.get('returnOnEquity', 'N/A'):.2f}",
-            'roa': f"{info.get('returnOnAssets', 'N/A'):.2f}",
+            'roe': roundNumericalString(info.get('returnOnEquity'), 2),
+            'roa': roundNumericalString(info.get('returnOnAssets'), 2),
             
             # If ROE/ROA missing, provide raw data for calculation
             'net_income': info.get('netIncomeToCommon', 'N/A'),
@@ -120,15 +114,245 @@ def get_stock_info(ticker: str) -> str:
             # Other metrics
             'profit_margin': info.get('profitMargins', 'N/A'),
             'operating_margin': info.get('operatingMargins', 'N/A'),
-           
-            # Full info for agent to explore
-            'full_info': info
-        }     
+        }
+
+        # PROJECTION: Only the requested fields, within the byte budget. The raw
+        # .info dict (150+ keys) stays behind the Get More Stock Fields tool.
+        requested = [f.strip() for f in fields.split(',') if f.strip()] or None
+        stock_info = project_fields(stock_info, requested, get_tool_config()['info_max_bytes'])
+        stock_info['more_fields_available'] = len(info)
 
         return stock_info       
+    except ProviderThrottledError:
+        return f"Yahoo Finance is rate limiting requests, so info for '{ticker}' is unavailable right now. Do not retry; mark the metrics as 'N/A'."
     except Exception as e:
         return f"Error fetching info for '{ticker}': {str(e)}"
 
+
+@tool("Get More Stock Fields")
+def get_more_stock_fields(ticker: str, fields: str = "") -> str:
+    """
+    Fetches additional raw Yahoo Finance fields that Get Stock Info does not include.
+
+    Use this tool only when a specific metric is missing from Get Stock Info.
+    Call it with no fields to list the available field names first.
+
+    Args:
+        ticker: A stock ticker symbol
+        fields: Comma-separated Yahoo Finance field names (e.g., 'beta, bookValue')
+
+    Returns:
+        The requested fields, the list of available field names, or an error message
+    """
+    try:
+        ticker = ticker.strip().upper()
+        info = load_info(ticker)
+
+        requested = [f.strip() for f in fields.split(',') if f.strip()]
+        if not requested:
+            return f"Available fields for {ticker}: {', '.join(sorted(info.keys()))}"
+
+        result = {field: info.get(field, 'N/A') for field in requested}
+        return project_fields(result, max_bytes=get_tool_config()['info_max_bytes'])
+    except Exception as e:
+        return f"Error fetching fields for '{ticker}': {str(e)}"
+
+
+@tool("Get Fundamental Ratios")
+def get_fundamental_ratios(ticker: str) -> str:
+    """
+    Computes ROE, ROA, P/E, PEG, debt-to-equity, margins and growth rates for a given ticker.
+
+    Use this tool instead of calculating ratios by hand. Ratios are computed from
+    the latest annual income statement and balance sheet, falling back to the
+    values Yahoo reports; each one says where it came from ('computed',
+    'reported' or 'unavailable') and what it was based on.
+
+    Args:
+        ticker: A stock ticker symbol
+
+    Returns:
+        A dictionary of ratios with provenance or an error message
+    """
+    try:
+        ticker = ticker.strip().upper()
+        ratios = compute_fundamentals(load_info(ticker), load_statements(ticker))
+        ratios['ticker'] = ticker
+        return ratios
+    except Exception as e:
+        return f"Error computing fundamental ratios for '{ticker}': {str(e)}"
+
+
+@tool("Get Stock Overview")
+def get_stock_overview(ticker: str) -> str:
+    """
+    Fetches the current price, company profile and fundamental ratios of a ticker in one step.
+
+    Use this tool at the start of an analysis instead of calling Get Stock Price,
+    Get Stock Info and Get Fundamental Ratios one after another: the price,
+    company info and financial statements are fetched in parallel.
+
+    Args:
+        ticker: A stock ticker symbol
+
+    Returns:
+        A dictionary with the price, profile and ratios (parts that could not be
+        fetched say so) or an error message
+    """
+    try:
+        ticker = ticker.strip().upper()
+
+        # CONCURRENCY: Quote, info and statements are independent lookups
+        bundle = run_coroutine(aload_stock_bundle(ticker))
+        quote, info, statements = bundle['quote'], bundle['info'], bundle['statements']
+
+        overview = {'ticker': ticker}
+
+        if isinstance(quote, ProviderThrottledError):
+            overview['price'] = 'N/A (Yahoo Finance is rate limiting requests; do not retry)'
+        elif isinstance(quote, Exception) or quote is None:
+            overview['price'] = 'N/A'
+        else:
+            overview['company_name'] = quote['name']
+            overview['price'] = round(quote['price'], 2)
+
+        if isinstance(info, Exception):
+            return f"Error fetching info for '{ticker}': {str(info)}"
+
+        overview.setdefault('company_name', info.get('longName', 'N/A'))
+        overview['sector'] = info.get('sector', 'N/A')
+        overview['industry'] = info.get('industry', 'N/A')
+        overview['market_cap'] = info.get('marketCap', 'N/A')
+
+        # EDGE CASE: Without statements the ratios fall back to the reported values
+        if isinstance(statements, Exception) or not statements:
+            statements = {'income': statement_to_dict(None), 'balance': statement_to_dict(None)}
+        price = overview['price'] if isinstance(overview['price'], float) else None
+        overview['ratios'] = compute_fundamentals(info, statements, price=price)
+
+        return overview
+    except Exception as e:
+        return f"Error fetching overview for '{ticker}': {str(e)}"
+
+
+@tool("Get Price History")
+def get_price_history(ticker: str, days: int = 365) -> str:
+    """
+    Summarises the daily price history of a given ticker symbol.
+
+    Use this tool when you need price movements over time: period high/low,
+    trailing returns and the latest close. Input should be a valid stock
+    ticker symbol (e.g., 'AAPL') and optionally the number of calendar days.
+
+    Args:
+        ticker: A stock ticker symbol
+        days: Calendar days of history to summarise (default one year)
+
+    Returns:
+        A dictionary summarising the price history or an error message
+    """
+    try:
+        ticker = ticker.strip().upper()
+        history = load_history(ticker, int(days))
+        if not history:
+            return f"No price history available for ticker '{ticker}'. Please verify the ticker symbol is correct."
+
+        close = history['close']
+        last = float(close[-1])
+
+        def trailing_return(sessions):
+            if close.size <= sessions:
+                return 'N/A'
+            return round(last / float(close[-sessions - 1]) - 1.0, 4)
+
+        return {
+            'ticker': ticker,
+            'start_date': str(history['date'][0]),
+            'end_date': str(history['date'][-1]),
+            'sessions': int(close.size),
+            'last_close': round(last, 2),
+            'period_high': round(float(history['high'].max()), 2),
+            'period_low': round(float(history['low'].min()), 2),
+            'period_return': round(last / float(close[0]) - 1.0, 4),
+            'return_1m': trailing_return(21),
+            'return_3m': trailing_return(63),
+            'average_volume': int(history['volume'].mean()),
+        }
+    except Exception as e:
+        return f"Error fetching price history for '{ticker}': {str(e)}"
+
+
+@tool("Get Risk Metrics")
+def get_risk_metrics(ticker: str) -> str:
+    """
+    Computes risk measures for a given ticker symbol from one year of daily closes
+    (adjusted for splits and dividends).
+
+    Use this tool instead of estimating volatility or risk yourself. It returns
+    annualized volatility, beta against the market benchmark, Sharpe and Sortino
+    ratios, maximum drawdown and 1-day historical Value at Risk.
+
+    Args:
+        ticker: A stock ticker symbol
+
+    Returns:
+        A dictionary of risk metrics or an error message
+    """
+    try:
+        ticker = ticker.strip().upper()
+        config = get_tool_config()
+
+        stock = load_history(ticker)
+        if not stock:
+            return f"No price history available for ticker '{ticker}'. Please verify the ticker symbol is correct."
+
+        # Beta needs the benchmark on exactly the same trading days
+        benchmark = load_history(config['risk_benchmark'])
+        if benchmark:
+            prices, benchmark_prices = align_series(stock['date'], stock['adj_close'],
+                                                    benchmark['date'], benchmark['adj_close'])
+        else:
+            prices, benchmark_prices = stock['adj_close'], None
+
+        metrics = compute_risk_metrics(prices, benchmark_prices, risk_free_rate=config['risk_free_rate'])
+        metrics['ticker'] = ticker
+        metrics['benchmark'] = config['risk_benchmark'] if benchmark else 'N/A'
+
+        return metrics
+    except Exception as e:
+        return f"Error computing risk metrics for '{ticker}': {str(e)}"
+
+
+@tool("Compare Stocks")
+def compare_stocks(tickers: str) -> str:
+    """
+    Fetches prices and key fundamentals for several stocks at once.
+
+    Use this tool when you need to compare or screen a list of companies.
+    Input should be a comma-separated list of ticker symbols (e.g., 'AAPL, MSFT, GOOGL').
+
+    Args:
+        tickers: Comma-separated stock ticker symbols
+
+    Returns:
+        A table with one row per ticker or an error message
+    """
+    try:
+        symbols = normalize_tickers(tickers)
+        if not symbols:
+            return "No ticker symbols provided. Please pass a comma-separated list such as 'AAPL, MSFT'."
+
+        # BATCHING: One bulk price download plus concurrent fundamentals lookups
+        prices = load_quotes(symbols)
+        infos = load_infos(symbols)
+        table = prices.join(infos.drop(columns=['shortName']))
+
+        return table.to_string()
+
+    except Exception as e:
+        return f"Error comparing stocks '{tickers}': {str(e)}"
+
+
 @tool("Get Market Data")
 def get_market_data(ticker: str) -> str:
     """
@@ -144,15 +368,15 @@ def get_market_data(ticker: str) -> str:
     A string with the current market data or an error message
     """
     try:        
-        config = get_config()
         ticker = ticker.strip().upper()
-        tavily_client = TavilyClient(config['tavily_api_key'])
         market_query = f"Bring up some of the latest market data for stock {ticker}"
 
-        search_response = tavily_client.search(market_query)
-        #print("Tavily search result:" + "\n")
-        #print(search_response)
-        #print("Tavily search result:" + "\n")
+        # CACHING: Identical (normalised) queries are answered from the search cache
+        search_response = search_cache.search(market_query)
+
+        # EDGE CASE: Articles returned by earlier searches are not repeated, so there may be none
+        if not search_response["results"]:
+            return f"No new market data articles for '{ticker}' since the last search."
 
         market_data = ""
         for result in search_response["results"]:
@@ -163,6 +387,8 @@ def get_market_data(ticker: str) -> str:
             {market_data}
             """
     
+    except ProviderThrottledError:
+        return f"Web search is rate limiting requests, so market data for '{ticker}' is unavailable right now. Do not retry."
     except Exception as e:
         # GRACEFUL DEGRADATION: Return useful error info instead of crashing
         return f"Error fetching market data for '{ticker}': {str(e)}. Please check the ticker symbol."
\ No newline at end of file
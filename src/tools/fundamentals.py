@@ -0,0 +1,160 @@
+"""Deterministic fundamental ratios computed from income statement and balance sheet data."""
+
+import math
+from typing import Any, Dict, List, Optional
+
+
+# Statement line items can appear under several names depending on the company
+NET_INCOME = ['Net Income', 'Net Income Common Stockholders', 'Net Income From Continuing Operation Net Minority Interest']
+REVENUE = ['Total Revenue', 'Operating Revenue']
+GROSS_PROFIT = ['Gross Profit']
+OPERATING_INCOME = ['Operating Income', 'Total Operating Income As Reported']
+DILUTED_EPS = ['Diluted EPS', 'Basic EPS']
+EQUITY = ['Stockholders Equity', 'Common Stock Equity', 'Total Equity Gross Minority Interest']
+TOTAL_ASSETS = ['Total Assets']
+TOTAL_DEBT = ['Total Debt']
+
+
+def statement_to_dict(frame) -> Dict[str, Any]:
+    """Convert a yfinance statement DataFrame (items x periods) to JSON-friendly lists, newest first."""
+    if frame is None or frame.empty:
+        return {'periods': [], 'items': {}}
+
+    frame = frame.sort_index(axis=1, ascending=False)
+    items = {}
+    for name, row in frame.iterrows():
+        items[str(name)] = [None if v is None or (isinstance(v, float) and math.isnan(v)) else float(v)
+                            for v in row.tolist()]
+
+    return {
+        'periods': [c.strftime('%Y-%m-%d') for c in frame.columns],
+        'items': items,
+    }
+
+
+def _line(statement: Dict[str, Any], names: List[str], index: int = 0) -> Optional[float]:
+    """Value of the first available line item for a period (0 = latest fiscal year)."""
+    for name in names:
+        values = statement['items'].get(name)
+        if values and len(values) > index and values[index] is not None:
+            return values[index]
+    return None
+
+
+def _period(statement: Dict[str, Any], index: int = 0) -> str:
+    periods = statement['periods']
+    return f"FY ending {periods[index]}" if len(periods) > index else "latest fiscal year"
+
+
+def _metric(value: Optional[float], source: str, basis: str, ndigits: int = 4) -> Dict[str, Any]:
+    if value is None or math.isnan(value) or math.isinf(value):
+        return {'value': 'N/A', 'source': 'unavailable', 'basis': basis}
+    return {'value': round(value, ndigits), 'source': source, 'basis': basis}
+
+
+def _ratio(numerator: Optional[float], denominator: Optional[float]) -> Optional[float]:
+    if numerator is None or denominator is None or denominator == 0:
+        return None
+    return numerator / denominator
+
+
+def _growth(current: Optional[float], previous: Optional[float]) -> Optional[float]:
+    # Growth from a zero or negative base has no meaningful sign, so it is not reported
+    if current is None or previous is None or previous <= 0:
+        return None
+    return current / previous - 1.0
+
+
+def _first(*candidates) -> Dict[str, Any]:
+    """Pick the first metric that has a value, else the last one (which explains why it is missing)."""
+    for candidate in candidates:
+        if candidate['source'] != 'unavailable':
+            return candidate
+    return candidates[-1]
+
+
+def compute_fundamentals(info: Dict[str, Any], statements: Dict[str, Any],
+                         price: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute profitability, valuation and growth ratios with provenance.
+
+    Ratios are computed from the latest annual statements where possible
+    ('computed', except P/E which prefers Yahoo's TTM figure), fall back to
+    the value Yahoo reports in .info ('reported'),
+    and are marked 'unavailable' otherwise. Every metric carries a 'basis'
+    describing exactly what it was derived from.
+
+    Args:
+        info: The yfinance .info payload
+        statements: {'income': {...}, 'balance': {...}} as served by the market data providers
+        price: Current share price (defaults to .info's currentPrice)
+
+    Returns:
+        Mapping of metric name to {'value', 'source', 'basis'}
+    """
+    income = statements['income']
+    balance = statements['balance']
+    fy = _period(income)
+    price = price if price is not None else info.get('currentPrice')
+
+    net_income = _line(income, NET_INCOME)
+    revenue = _line(income, REVENUE)
+    equity = _line(balance, EQUITY)
+    assets = _line(balance, TOTAL_ASSETS)
+    eps = _line(income, DILUTED_EPS)
+    eps_growth = _growth(eps, _line(income, DILUTED_EPS, 1))
+
+    def reported(key, basis, scale=1.0):
+        value = info.get(key)
+        value = value * scale if isinstance(value, (int, float)) else None
+        return _metric(value, 'reported', basis)
+
+    pe_computed = _metric(_ratio(price, eps) if eps and eps > 0 else None, 'computed',
+                          f"Price / Diluted EPS ({fy})", 2)
+    # Yahoo's TTM P/E is the market convention, so it wins over the fiscal-year figure
+    pe = _first(reported('trailingPE', "Yahoo trailing P/E (TTM)"), pe_computed)
+
+    peg_value = None
+    if pe['source'] != 'unavailable' and eps_growth is not None and eps_growth > 0:
+        peg_value = pe['value'] / (eps_growth * 100)
+
+    return {
+        'roe': _first(
+            _metric(_ratio(net_income, equity), 'computed', f"Net Income / Stockholders Equity ({fy})"),
+            reported('returnOnEquity', "Yahoo returnOnEquity (TTM)"),
+        ),
+        'roa': _first(
+            _metric(_ratio(net_income, assets), 'computed', f"Net Income / Total Assets ({fy})"),
+            reported('returnOnAssets', "Yahoo returnOnAssets (TTM)"),
+        ),
+        'pe_ratio': pe,
+        'peg_ratio': _first(
+            _metric(peg_value, 'computed', f"P/E / (EPS growth x 100) ({fy})", 2),
+            reported('trailingPegRatio', "Yahoo trailingPegRatio"),
+        ),
+        'debt_to_equity': _first(
+            _metric(_ratio(_line(balance, TOTAL_DEBT), equity), 'computed', f"Total Debt / Stockholders Equity ({fy})", 2),
+            # Yahoo reports debt-to-equity as a percentage
+            reported('debtToEquity', "Yahoo debtToEquity / 100 (MRQ)", scale=0.01),
+        ),
+        'gross_margin': _first(
+            _metric(_ratio(_line(income, GROSS_PROFIT), revenue), 'computed', f"Gross Profit / Revenue ({fy})"),
+            reported('grossMargins', "Yahoo grossMargins (TTM)"),
+        ),
+        'operating_margin': _first(
+            _metric(_ratio(_line(income, OPERATING_INCOME), revenue), 'computed', f"Operating Income / Revenue ({fy})"),
+            reported('operatingMargins', "Yahoo operatingMargins (TTM)"),
+        ),
+        'profit_margin': _first(
+            _metric(_ratio(net_income, revenue), 'computed', f"Net Income / Revenue ({fy})"),
+            reported('profitMargins', "Yahoo profitMargins (TTM)"),
+        ),
+        'revenue_growth': _first(
+            _metric(_growth(revenue, _line(income, REVENUE, 1)), 'computed', f"Revenue YoY ({fy} vs prior year)"),
+            reported('revenueGrowth', "Yahoo revenueGrowth (quarterly YoY)"),
+        ),
+        'eps_growth': _first(
+            _metric(eps_growth, 'computed', f"Diluted EPS YoY ({fy} vs prior year)"),
+            reported('earningsGrowth', "Yahoo earningsGrowth (quarterly YoY)"),
+        ),
+    }
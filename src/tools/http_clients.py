@@ -0,0 +1,123 @@
+"""Process-wide registry of pooled, long-lived HTTP clients for the data providers."""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+import requests
+import yfinance as yf
+from requests.adapters import HTTPAdapter
+
+from config.settings import get_config, get_http_config
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+class PooledTavilyClient:
+    """
+    Minimal Tavily search client on top of a keep-alive requests.Session.
+
+    tavily-python's TavilyClient opens a new connection (and TLS handshake)
+    for every request; this client reuses pooled connections instead and
+    returns the same response shape as TavilyClient.search().
+    """
+
+    def __init__(self, api_key: str, pool_size: int, timeout: float):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': f"Bearer {api_key}",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+
+    def search(self, query: str, **kwargs) -> Dict[str, Any]:
+        """
+        Run a Tavily search.
+
+        Args:
+            query: Search query
+            **kwargs: Extra Tavily search parameters (e.g. max_results, topic)
+
+        Returns:
+            The Tavily JSON response
+        """
+        response = self.session.post(TAVILY_SEARCH_URL, json={'query': query, **kwargs}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class ClientRegistry:
+    """
+    Creates each provider client once per process and hands out the same instance.
+
+    Also bounds how many requests may be in flight per provider at once, so a
+    burst of parallel tool calls queues locally instead of opening a new
+    connection per call.
+    """
+
+    def __init__(self):
+        self.config = get_http_config()
+        self._lock = threading.Lock()
+        self._tavily = None
+        self._yahoo_session = None
+        self._yahoo_session_ready = False
+        self._limits = {
+            provider: threading.BoundedSemaphore(limit)
+            for provider, limit in self.config['max_concurrency'].items()
+        }
+
+    def tavily(self) -> PooledTavilyClient:
+        """The shared Tavily client (reads the API key once, on first use)."""
+        with self._lock:
+            if self._tavily is None:
+                self._tavily = PooledTavilyClient(
+                    get_config()['tavily_api_key'],
+                    pool_size=self.config['pool_size'],
+                    timeout=self.config['timeout'],
+                )
+            return self._tavily
+
+    def yahoo_session(self):
+        """
+        The shared Yahoo session, or None to let yfinance use its own.
+
+        Recent yfinance versions require a curl_cffi session; when curl_cffi is
+        not installed yfinance keeps managing its internal shared session.
+        """
+        with self._lock:
+            if not self._yahoo_session_ready:
+                try:
+                    from curl_cffi import requests as curl_requests
+                    self._yahoo_session = curl_requests.Session(
+                        impersonate="chrome", timeout=self.config['timeout']
+                    )
+                except ImportError:
+                    self._yahoo_session = None
+                self._yahoo_session_ready = True
+            return self._yahoo_session
+
+    def yahoo_ticker(self, ticker: str) -> yf.Ticker:
+        """A yfinance Ticker bound to the shared Yahoo session."""
+        session = self.yahoo_session()
+        return yf.Ticker(ticker, session=session) if session is not None else yf.Ticker(ticker)
+
+    @contextmanager
+    def limit(self, provider: str):
+        """
+        Hold one of the provider's concurrency slots for the duration of a request.
+
+        Args:
+            provider: 'yfinance' or 'tavily' (unknown providers are not limited)
+        """
+        semaphore = self._limits.get(provider)
+        if semaphore is None:
+            yield
+            return
+
+        with semaphore:
+            yield
+
+
+clients = ClientRegistry()
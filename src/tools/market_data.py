@@ -0,0 +1,243 @@
+"""Cached access to market data shared by the single-ticker and batch tools."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .data_cache import market_cache
+from .http_clients import clients
+from .rate_limiter import call_provider
+from .price_store import price_store
+from .providers import market_providers
+from .quote_engine import quote_engine
+
+# Upper bound on concurrent .info requests so a large watchlist doesn't get us throttled
+MAX_INFO_WORKERS = 8
+
+# Columns returned by load_infos() unless the caller asks for others
+SUMMARY_FIELDS = [
+    'shortName',
+    'sector',
+    'industry',
+    'marketCap',
+    'trailingPE',
+    'trailingPegRatio',
+    'debtToEquity',
+    'returnOnEquity',
+    'returnOnAssets',
+    'revenueGrowth',
+    'profitMargins',
+    'operatingMargins',
+]
+
+
+def normalize_tickers(tickers: Iterable[str]) -> List[str]:
+    """
+    Clean a list of ticker symbols, dropping blanks and duplicates but keeping order.
+
+    Args:
+        tickers: Ticker symbols, or a single comma-separated string
+
+    Returns:
+        Uppercase, de-duplicated ticker symbols
+    """
+    if isinstance(tickers, str):
+        tickers = tickers.split(',')
+
+    result = []
+    for ticker in tickers:
+        ticker = ticker.strip().upper()
+        if ticker and ticker not in result:
+            result.append(ticker)
+    return result
+
+
+def fetch_info(ticker: str) -> Dict[str, Any]:
+    """Fetch the full .info payload and record the company name for the quote engine."""
+    info = market_providers.fetch('info', ticker) or {}
+    quote_engine.remember_name(ticker, info)
+    return info
+
+
+def load_info(ticker: str) -> Dict[str, Any]:
+    """
+    Return the .info payload for a ticker, served from the cache when fresh.
+
+    Args:
+        ticker: Stock ticker symbol (uppercase)
+
+    Returns:
+        The yfinance info dictionary
+    """
+    return market_cache.get_or_fetch(ticker, 'info', lambda: fetch_info(ticker))
+
+
+def load_statements(ticker: str) -> Dict[str, Any]:
+    """
+    Return the annual income statement and balance sheet, served from the cache when fresh.
+
+    Args:
+        ticker: Stock ticker symbol (uppercase)
+
+    Returns:
+        {'income': {...}, 'balance': {...}}, each with 'periods' and 'items' (newest first)
+    """
+    return market_cache.get_or_fetch(ticker, 'statements', lambda: market_providers.fetch('statements', ticker))
+
+
+async def aload_stock_bundle(ticker: str) -> Dict[str, Any]:
+    """
+    Load the quote, .info payload and statements of a ticker concurrently.
+
+    The three lookups are independent, so they run side by side on worker
+    threads instead of one after another. A failing part does not fail the
+    others: its value is the exception instead.
+
+    Args:
+        ticker: Stock ticker symbol (uppercase)
+
+    Returns:
+        {'quote': ..., 'info': ..., 'statements': ...}
+    """
+    quote, info, statements = await asyncio.gather(
+        asyncio.to_thread(quote_engine.get_quote, ticker),
+        asyncio.to_thread(load_info, ticker),
+        asyncio.to_thread(load_statements, ticker),
+        return_exceptions=True,
+    )
+    return {'quote': quote, 'info': info, 'statements': statements}
+
+
+def run_coroutine(coroutine):
+    """
+    Run a coroutine to completion from synchronous code (e.g. a crewAI tool).
+
+    EDGE CASE: asyncio.run() refuses to start when the calling thread already
+    runs an event loop, so in that case the coroutine runs on a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def load_history(ticker: str, days: int = 365) -> Dict[str, np.ndarray]:
+    """
+    Return recent daily price history for a ticker from the local price store.
+
+    The store is synced first, which only downloads the sessions missing since
+    the last sync (and nothing at all if the ticker was synced recently).
+
+    Args:
+        ticker: Stock or index symbol (uppercase, e.g. 'AAPL' or '^GSPC')
+        days: Calendar days of history to return
+
+    Returns:
+        Zero-copy column arrays ('date', 'open', 'high', 'low', 'close', 'adj_close', 'volume'),
+        or an empty dict if no history is available
+    """
+    price_store.sync(ticker)
+    start = np.datetime64('today', 'D') - days
+    history = price_store.read(ticker, start=str(start))
+    if len(history['date']) == 0:
+        return {}
+    return history
+
+
+def load_quotes(tickers: Iterable[str]) -> pd.DataFrame:
+    """
+    Latest prices for many tickers with a single bulk download.
+
+    Fresh quotes are served from the cache; only the remaining tickers are
+    downloaded, all in one yf.download() call.
+
+    Args:
+        tickers: Ticker symbols, or a comma-separated string
+
+    Returns:
+        DataFrame indexed by ticker with 'name' and 'price' columns
+        (price is NaN for tickers Yahoo returned nothing for)
+    """
+    tickers = normalize_tickers(tickers)
+
+    quotes = {}
+    missing = []
+    for ticker in tickers:
+        quote = market_cache.get(ticker, 'quote')
+        if quote is None:
+            missing.append(ticker)
+        else:
+            quotes[ticker] = quote
+
+    if missing:
+        session = clients.yahoo_session()
+        kwargs = {'session': session} if session is not None else {}
+        data = call_provider('yfinance', lambda: yf.download(
+            missing, period="5d", progress=False, threads=True, auto_adjust=False, **kwargs
+        ))
+        closes = data['Close'] if not data.empty else pd.DataFrame()
+
+        # Older yfinance versions return a Series for a single ticker
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(name=missing[0])
+
+        last_prices = closes.ffill().iloc[-1] if not closes.empty else pd.Series(dtype=float)
+        for ticker in missing:
+            price = last_prices.get(ticker)
+            if price is None or pd.isna(price):
+                continue
+            quote = {
+                'ticker': ticker,
+                'name': quote_engine.display_name(ticker),
+                'price': float(price),
+                'currency': 'USD',
+            }
+            market_cache.set(ticker, 'quote', quote)
+            quotes[ticker] = quote
+
+    frame = pd.DataFrame(
+        {
+            'name': [quotes.get(t, {}).get('name', t) for t in tickers],
+            'price': [quotes.get(t, {}).get('price', float('nan')) for t in tickers],
+        },
+        index=pd.Index(tickers, name='ticker'),
+    )
+    return frame
+
+
+def load_infos(tickers: Iterable[str], fields: List[str] = None, max_workers: int = MAX_INFO_WORKERS) -> pd.DataFrame:
+    """
+    Fundamentals for many tickers, fetched concurrently under a bounded pool.
+
+    Args:
+        tickers: Ticker symbols, or a comma-separated string
+        fields: .info keys to keep as columns (defaults to SUMMARY_FIELDS)
+        max_workers: Maximum number of concurrent .info requests
+
+    Returns:
+        DataFrame indexed by ticker with one column per field plus an 'error'
+        column that is None for tickers fetched successfully
+    """
+    tickers = normalize_tickers(tickers)
+    fields = fields or SUMMARY_FIELDS
+
+    def _load(ticker):
+        try:
+            return load_info(ticker), None
+        except Exception as e:
+            return {}, str(e)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers) or 1))) as pool:
+        results = list(pool.map(_load, tickers))
+
+    columns = {field: [info.get(field) for info, _ in results] for field in fields}
+    columns['error'] = [error for _, error in results]
+
+    return pd.DataFrame(columns, index=pd.Index(tickers, name='ticker'))
@@ -1,45 +1,353 @@
 #import os
+import asyncio
+import atexit
+import hashlib
+import re
+import threading
+import time
 from pathlib import Path
 import sys
-import chromadb
-from chromadb.utils import embedding_functions
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from config.settings import get_config
+from config.settings import get_memory_config
+from .vector_backends import VectorBackend, build_vector_backend
 
 # 1. SETUP: Define where the memory lives
 # "persistent" means it saves to your hard drive, so agents remember things 
 # even if you restart the script.
 DATA_PATH = "./internal_memory_db"
 
+# Ticker partitions are named <collection>__<ticker>
+PARTITION_SEPARATOR = "__"
+
+# Temporary names while compact() rebuilds a collection: the new copy, and the
+# original until the copy has taken its place
+COMPACTING_SUFFIX = "_compacting"
+BACKUP_SUFFIX = "_precompact"
+
+def content_id(text: str) -> str:
+    """
+    Content-addressed document ID: the SHA-256 of the text with whitespace normalised.
+    """
+    normalized = " ".join(text.split())
+    return "doc_" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def finding_metadata(source: str, ticker: str = None, run_id: str = None,
+                     agent_role: str = None, metric_type: str = None) -> dict:
+    """
+    Metadata recorded with every finding, so searches can be scoped.
+    Missing values are left out (Chroma metadata can't hold None).
+    """
+    metadata = {
+        "source": source,
+        "ticker": ticker.strip().upper() if ticker else None,
+        "run_id": run_id,
+        "agent_role": agent_role,
+        "metric_type": metric_type.strip().lower() if metric_type else None,
+        "timestamp": time.time(),
+    }
+    return {key: value for key, value in metadata.items() if value is not None}
+
+def build_where(ticker: str = None, run_id: str = None, agent_role: str = None,
+                metric_type: str = None, since: float = None):
+    """
+    Chroma `where` filter for the given metadata values (None means no filter).
+    """
+    conditions = []
+    if ticker:
+        conditions.append({"ticker": ticker.strip().upper()})
+    if run_id:
+        conditions.append({"run_id": run_id})
+    if agent_role:
+        conditions.append({"agent_role": agent_role})
+    if metric_type:
+        conditions.append({"metric_type": metric_type.strip().lower()})
+    if since is not None:
+        conditions.append({"timestamp": {"$gte": since}})
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+def _ticker_filter(where: dict):
+    """
+    The ticker a `where` filter pins, if any.
+    """
+    if not where:
+        return None
+    if isinstance(where.get("ticker"), str):
+        return where["ticker"]
+    for condition in where.get("$and", []):
+        if isinstance(condition.get("ticker"), str):
+            return condition["ticker"]
+    return None
+
 class FinancialMemory:
-    def __init__(self, collection_name="financial_research"):
+    def __init__(self, collection_name="financial_research", vector_backend: VectorBackend = None):
         """
         Initialize the Vector Database.
+        Args:
+            collection_name: Base name of the collections.
+            vector_backend: Where vectors live; defaults to MEMORY_VECTOR_BACKEND
+                (persistent Chroma at DATA_PATH, or an in-process NumPy matrix).
         """
         print(f"🧠 Initializing Memory: {collection_name}")
+
+        # Imported here: the embedding backends pull in chromadb, which only
+        # the process that actually opens the memory should pay for
+        from .embedding_cache import CachedEmbeddingFunction
+        from .embeddings import build_embedding_function
         
-        # Connect to ChromaDB (it creates the folder if it doesn't exist)
-        self.client = chromadb.PersistentClient(path=DATA_PATH)
+        # Connect to the vector store (Chroma creates the folder if it doesn't exist)
+        self.client = vector_backend or build_vector_backend(chroma_path=DATA_PATH)
         
-        # Use OpenAI's embedding model (standard for this project)
-        # Ensure OPENAI_API_KEY is set in your .env file
-        config = get_config()
-        openai_api_key = config["openai_api_key"]
-
-        self.openai_ef = embedding_functions.OpenAIEmbeddingFunction(
-            api_key=openai_api_key, ##os.getenv("OPENAI_API_KEY"),
-            model_name="text-embedding-3-small" # Cheaper and faster
+        # Embeddings come from OpenAI (standard for this project, needs OPENAI_API_KEY)
+        # or from a local CPU model, depending on EMBEDDING_BACKEND
+        memory_config = get_memory_config()
+        self.backend = memory_config['embedding_backend'].lower()
+        self.embedding_function, self.embedding_model = build_embedding_function(self.backend)
+
+        # CACHING: Texts embedded before (documents and queries alike) are
+        # served from a local store instead of being embedded again
+        self.embedder = CachedEmbeddingFunction(
+            self.embedding_function,
+            model=self.embedding_model,
+            path=memory_config['embedding_cache_path'],
+            max_entries=memory_config['embedding_cache_size'],
         )
 
+        # Vectors of different models can't share a collection, so local
+        # backends get their own
+        if self.backend != 'openai':
+            collection_name = f"{collection_name}_{self.backend.replace('-', '_')}"
+
+        # PARTITIONING: Findings about a ticker live in that ticker's own
+        # collection, so its index stays small however many tickers are stored.
+        # Findings without a ticker go to the base collection.
+        self.collection_name = collection_name
+        self.partition_by = memory_config['partition_by'].lower()
+        self.retention = {
+            'news': memory_config['news_retention_days'],
+            'default': memory_config['retention_days'],
+        }
+        self._partitions = {}
+        self._partitions_lock = threading.Lock()
+        self.search_partition_limit = memory_config['search_partition_limit']
+
+        # Before anything opens (and so re-creates empty) a collection that an
+        # interrupted compaction left under a temporary name
+        self._recover_compaction()
+
         # Create or Get the collection (like a 'table' in SQL)
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            embedding_function=self.openai_ef
-        )
+        self.collection = self._partition(None)
+
+
+        # BATCHING: Buffered findings are embedded and written together
+        self.batch_size = memory_config['write_batch_size']
+        self.flush_interval = memory_config['write_flush_interval']
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._flush_timer = None
+        # Error of a failed write, kept for the next caller (a timer flush has no one to tell)
+        self._flush_error = None
+
+        # Never lose buffered findings when the process exits
+        atexit.register(self.flush)
+
+    def partition_name(self, ticker: str = None) -> str:
+        """
+        Collection name holding the findings about a ticker.
+        """
+        if not ticker or self.partition_by != 'ticker':
+            return self.collection_name
+        # Chroma names allow [a-zA-Z0-9._-] and must end with a letter or digit
+        suffix = re.sub(r'[^a-z0-9._-]', '_', ticker.strip().lower()).strip('._-')
+        return f"{self.collection_name}{PARTITION_SEPARATOR}{suffix}" if suffix else self.collection_name
+
+    def _open(self, name: str):
+        with self._partitions_lock:
+            collection = self._partitions.get(name)
+            if collection is not None:
+                return collection
+            collection = self.client.get_or_create_collection(
+                name=name,
+                embedding_function=self.embedder
+            )
+            self._partitions[name] = collection
+
+        # RETENTION: Expired findings are dropped the first time a partition is
+        # opened by this process, so stale news never piles up
+        self._evict(collection)
+        return collection
+
+    def _partition(self, ticker: str = None):
+        return self._open(self.partition_name(ticker))
+
+    def partitions(self) -> list:
+        """
+        Names of all collections of this memory (the base one and every partition).
+        """
+        names = self.client.list_collections()
+        prefix = self.collection_name + PARTITION_SEPARATOR
+        return [n for n in names if n == self.collection_name
+                or (self.partition_by == 'ticker' and n.startswith(prefix)
+                    and not n.endswith((COMPACTING_SUFFIX, BACKUP_SUFFIX)))]
+
+    def migrate_partitions(self, page_size: int = 1000) -> int:
+        """
+        Move findings with a ticker out of the base collection into their
+        ticker's partition (memories written before partitioning), keeping
+        their stored embeddings so nothing is re-embedded. It scans the whole
+        base collection, so it is run once by hand (`python -m
+        tools.memory_store migrate`), not on every start.
+        Returns:
+            How many findings were moved.
+        """
+        if self.partition_by != 'ticker':
+            return 0
+
+        base = self._open(self.collection_name)
+        targets = {}
+        offset = 0
+        while True:
+            page = base.get(include=['metadatas'], limit=page_size, offset=offset)
+            if not len(page['ids']):
+                break
+            for doc_id, metadata in zip(page['ids'], page['metadatas']):
+                name = self.partition_name((metadata or {}).get("ticker"))
+                if name != self.collection_name:
+                    targets.setdefault(name, []).append(doc_id)
+            offset += len(page['ids'])
+
+        moved = 0
+        for name, ids in targets.items():
+            target = self._open(name)
+            for start in range(0, len(ids), page_size):
+                page = base.get(ids=ids[start:start + page_size],
+                                include=['documents', 'metadatas', 'embeddings'])
+                target.upsert(
+                    ids=page['ids'],
+                    documents=page['documents'],
+                    metadatas=page['metadatas'],
+                    embeddings=page['embeddings']
+                )
+                base.delete(ids=page['ids'])
+            moved += len(ids)
+
+        if moved:
+            print(f"📦 Moved {moved} findings into their ticker partitions")
+        return moved
+
+    def _evict(self, collection) -> int:
+        now = time.time()
+        removed = 0
+        for metric_filter, days in (({"metric_type": "news"}, self.retention['news']),
+                                    ({"metric_type": {"$ne": "news"}}, self.retention['default'])):
+            if not days:
+                continue
+            where = {"$and": [metric_filter, {"timestamp": {"$lt": now - days * 86400}}]}
+            expired = collection.get(where=where, include=[])['ids']
+            if expired:
+                collection.delete(ids=expired)
+                removed += len(expired)
+        if removed:
+            print(f"🧹 Evicted {removed} expired findings from {collection.name}")
+        return removed
+
+    def evict_expired(self) -> int:
+        """
+        Apply the retention policy to every partition.
+        Returns:
+            How many findings were deleted.
+        """
+        return sum(self._evict(self._open(name)) for name in self.partitions())
+
+    def compact(self, name: str = None, page_size: int = 1000) -> int:
+        """
+        Rebuild collections so their HNSW index holds no deleted entries.
+        Each partition is copied, with its stored embeddings (nothing is
+        re-embedded), into a fresh collection that then replaces it. The
+        original is renamed aside and only deleted once the copy has taken its
+        name, so at every point one complete copy exists; an interrupted
+        compaction is finished or rolled back by the next call.
+        Args:
+            name: Collection to compact (defaults to every partition).
+            page_size: Findings copied per round trip.
+        Returns:
+            How many findings were copied.
+        """
+        self.flush()
+        self._recover_compaction()
+        copied = 0
+        for partition in ([name] if name else self.partitions()):
+            source = self._open(partition)
+            self._evict(source)
+
+            # Build the replacement first, so a failure never loses the original
+            staging_name = partition + COMPACTING_SUFFIX
+            try:
+                self.client.delete_collection(staging_name)
+            except Exception:
+                pass
+            staging = self.client.create_collection(name=staging_name, embedding_function=self.embedder)
+
+            count = 0
+            while True:
+                page = source.get(include=['documents', 'metadatas', 'embeddings'],
+                                  limit=page_size, offset=count)
+                if not len(page['ids']):
+                    break
+                staging.add(
+                    ids=page['ids'],
+                    documents=page['documents'],
+                    metadatas=page['metadatas'],
+                    embeddings=page['embeddings']
+                )
+                count += len(page['ids'])
+
+            with self._partitions_lock:
+                source.modify(name=partition + BACKUP_SUFFIX)
+                staging.modify(name=partition)
+                self._partitions[partition] = staging
+                if partition == self.collection_name:
+                    self.collection = staging
+            self.client.delete_collection(partition + BACKUP_SUFFIX)
+
+            copied += count
+            print(f"🗜️ Compacted {partition}: {count} findings")
+        return copied
+
+    def _recover_compaction(self):
+        """
+        Finish or roll back a compaction that was interrupted.
+        A missing collection is restored from its complete copy (the staging
+        copy once the original was renamed aside, else the original itself);
+        leftovers next to an intact collection are dropped.
+        """
+        names = set(self.client.list_collections())
+        leftovers = [n for n in names if n.startswith(self.collection_name)
+                     and n.endswith((COMPACTING_SUFFIX, BACKUP_SUFFIX))]
+        for partition in {n[:-len(COMPACTING_SUFFIX)] if n.endswith(COMPACTING_SUFFIX)
+                          else n[:-len(BACKUP_SUFFIX)] for n in leftovers}:
+            staging, backup = partition + COMPACTING_SUFFIX, partition + BACKUP_SUFFIX
+            if partition not in names:
+                # The staging copy is complete once the original was renamed aside
+                # (or, with older versions, deleted); otherwise the backup is
+                restore = staging if staging in names else backup
+                self.client.get_or_create_collection(restore, embedding_function=self.embedder).modify(name=partition)
+                names.add(partition)
+                names.discard(restore)
+                print(f"♻️ Restored {partition} from an interrupted compaction")
+            for leftover in (staging, backup):
+                if leftover in names:
+                    self.client.delete_collection(leftover)
+            with self._partitions_lock:
+                self._partitions.pop(partition, None)
+            if partition == self.collection_name and hasattr(self, 'collection'):
+                self.collection = self._open(partition)
 
     def save_context(self, text: str, metadata: dict):
         """
@@ -48,36 +356,221 @@ class FinancialMemory:
             text: The actual content (e.g., news snippet).
             metadata: Extra info (e.g., {'source': 'Bloomberg', 'ticker': 'AAPL'})
         """
-        # We need a unique ID for every entry. We can generate one based on the count.
-        # In a real app, use UUIDs. Here, simplistic counting works for demos.
-        doc_id = f"doc_{self.collection.count() + 1}"
-        
-        self.collection.add(
-            documents=[text],
-            metadatas=[metadata],
-            ids=[doc_id]
-        )
-        print(f"💾 Saved to memory: {text[:30]}...")
+        if self.save_many([text], [metadata]):
+            print(f"💾 Saved to memory: {text[:30]}...")
+        else:
+            print(f"♻️ Already in memory: {text[:30]}...")
+
+    def save_many(self, texts: list, metadatas: list) -> int:
+        """
+        Save several findings at once.
+        The new findings are embedded in one request and written in one call;
+        findings already stored (same content) are skipped without embedding.
+        Args:
+            texts: The contents to remember.
+            metadatas: One metadata dictionary per text.
+        Returns:
+            How many findings were new.
+        """
+        # IDEMPOTENCY: The ID is the content hash, so saving a finding twice
+        # (e.g. re-running a ticker) neither grows the DB nor re-embeds it
+        partitions = {}
+        for text, metadata in zip(texts, metadatas):
+            batch = partitions.setdefault(self.partition_name(metadata.get("ticker")), {})
+            batch.setdefault(content_id(text), (text, metadata))
+
+        stored = 0
+        for batch in partitions.values():
+            collection = self._partition(next(iter(batch.values()))[1].get("ticker"))
+            existing = set(collection.get(ids=list(batch), include=[])['ids'])
+            new_ids = [doc_id for doc_id in batch if doc_id not in existing]
+            if existing:
+                # Re-found in this run: refresh the metadata (run, timestamp) without re-embedding
+                collection.update(
+                    ids=list(existing),
+                    metadatas=[batch[doc_id][1] for doc_id in existing]
+                )
+            if new_ids:
+                collection.upsert(
+                    documents=[batch[doc_id][0] for doc_id in new_ids],
+                    metadatas=[batch[doc_id][1] for doc_id in new_ids],
+                    ids=new_ids
+                )
+            stored += len(new_ids)
+
+        if len(texts) > 1:
+            print(f"💾 Saved {stored} findings to memory ({len(texts) - stored} already stored)")
+        return stored
+
+    def buffer_context(self, text: str, metadata: dict):
+        """
+        Queue a finding for the next batched write.
+        The buffer is flushed once it holds `batch_size` findings, or
+        `flush_interval` seconds after the first buffered finding.
+        If an earlier write failed, the whole buffer is written right away
+        instead, so the failure reaches the caller.
+        Args:
+            text: The actual content (e.g., news snippet).
+            metadata: Extra info (e.g., {'source': 'Bloomberg', 'ticker': 'AAPL'})
+        Raises:
+            Exception: The error of the write, if writing now failed.
+        """
+        with self._buffer_lock:
+            self._buffer.append((text, metadata))
+            full = len(self._buffer) >= self.batch_size or self._flush_error is not None
+            if not full and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self._flush_in_background)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if full:
+            self.flush()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️ Buffered findings could not be saved, will retry: {e}")
+
+    def flush(self) -> int:
+        """
+        Write all buffered findings in one batch.
+        On failure the findings go back into the buffer (nothing is lost) and
+        the error is raised; it is also remembered, so the next buffer_context()
+        retries the write right away.
+        Returns:
+            How many findings were written.
+        """
+        with self._buffer_lock:
+            pending, self._buffer = self._buffer, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
 
-    def query_memory(self, query: str, n_results=3):
+        if pending:
+            texts, metadatas = zip(*pending)
+            try:
+                self.save_many(list(texts), list(metadatas))
+            except Exception as e:
+                with self._buffer_lock:
+                    self._buffer = pending + self._buffer
+                    self._flush_error = e
+                raise
+
+        with self._buffer_lock:
+            self._flush_error = None
+        return len(pending)
+
+    def _search(self, queries: list, n_results: int, where: dict = None) -> list:
+        """
+        Vector search for several queries at once.
+        The queries are embedded in one request. A ticker in `where` selects
+        that ticker's partition; without one, up to `search_partition_limit`
+        partitions are searched (the base collection and those this process
+        already uses first) and the hits are merged by distance.
+        Returns:
+            The matching documents per query, closest first.
+        """
+        # Read your writes: buffered findings must be searchable
+        self.flush()
+
+        ticker = _ticker_filter(where)
+        if ticker or self.partition_by != 'ticker':
+            names = [self.partition_name(ticker)]
+        else:
+            # Each partition costs a query, so an unscoped search is capped
+            with self._partitions_lock:
+                opened = list(self._partitions)
+            available = self.partitions()
+            ranked = [self.collection_name] + [n for n in opened if n in available] + sorted(available)
+            names = list(dict.fromkeys(n for n in ranked if n in available))
+            if len(names) > self.search_partition_limit:
+                print(f"⚠️ Searching {self.search_partition_limit} of {len(names)} partitions; "
+                      "pass a ticker to search a specific one")
+                names = names[:self.search_partition_limit]
+
+        embeddings = self.embedder(queries)
+        hits = [[] for _ in queries]
+        for name in names:
+            collection = self._open(name)
+            if not collection.count():
+                continue
+            results = collection.query(
+                query_embeddings=embeddings,
+                n_results=n_results,
+                where=where,
+                include=['documents', 'distances']
+            )
+            for found, documents, distances in zip(hits, results['documents'], results['distances']):
+                found.extend(zip(distances, documents))
+
+        return [[document for _, document in sorted(found, key=lambda hit: hit[0])[:n_results]]
+                for found in hits]
+
+    def query_memory(self, query: str, n_results=3, where: dict = None):
         """
         The Analyst/Reporter uses this to 'Recall' info.
         Args:
             query: The question (e.g., "What are the risks for Tesla?")
             n_results: How many relevant snippets to return.
+            where: Optional metadata filter (see build_where()), applied before
+                the vector search so only matching findings are compared. A ticker
+                in it limits the search to that ticker's partition.
         """
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results
-        )
-        
-        # Chroma returns a complex object; let's simplify it for the Agent
-        # It returns lists of lists, so we flatten it.
-        found_texts = results['documents'][0]
+        # One query in, one list of documents out; flatten it for the Agent
+        found_texts = self._search([query], n_results, where)[0]
         return "\n\n".join(found_texts)
 
-# Simple test to run if you execute this file directly
+    def query_many(self, queries: list, n_results=3, where: dict = None) -> list:
+        """
+        Recall info for several questions at once.
+        All questions are embedded in one request and searched in one query
+        (instead of one embedding request and one search per question).
+        Args:
+            queries: The questions (e.g., ["AAPL P/E", "AAPL news", "AAPL risks"])
+            n_results: How many relevant snippets to return per question.
+            where: Optional metadata filter shared by all questions (see query_memory()).
+        Returns:
+            One string of snippets per question, in the order of `queries`.
+        """
+        unique = list(dict.fromkeys(queries))
+        if not unique:
+            return []
+
+        results = self._search(unique, n_results, where)
+        found = {query: "\n\n".join(texts) for query, texts in zip(unique, results)}
+        return [found[query] for query in queries]
+
+    async def asave_context(self, text: str, metadata: dict):
+        """
+        Async variant of save_context(); the write runs on a worker thread.
+        """
+        await asyncio.to_thread(self.save_context, text, metadata)
+
+    async def aquery_memory(self, query: str, n_results=3, where: dict = None):
+        """
+        Async variant of query_memory(), so several recalls can be gathered at once.
+        """
+        return await asyncio.to_thread(self.query_memory, query, n_results, where)
+
+# Simple test to run if you execute this file directly, plus maintenance commands:
+#   python -m tools.memory_store partitions   list the collections and their sizes
+#   python -m tools.memory_store migrate      move findings with a ticker into their partition
+#   python -m tools.memory_store evict        apply the retention policy now
+#   python -m tools.memory_store compact      evict, then rebuild every index
 if __name__ == "__main__":
     mem = FinancialMemory()
-    mem.save_context("Tesla Q3 revenue grew by 20% year over year.", {"ticker": "TSLA"})
-    print("Querying:", mem.query_memory("How did Tesla do financially?"))
\ No newline at end of file
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if command == "partitions":
+        for name in mem.partitions():
+            print(f"{name}: {mem._open(name).count()} findings")
+    elif command == "migrate":
+        print(f"Moved {mem.migrate_partitions()} findings")
+    elif command == "evict":
+        print(f"Evicted {mem.evict_expired()} expired findings")
+    elif command == "compact":
+        print(f"Compacted {mem.compact()} findings")
+    else:
+        mem.save_context("Tesla Q3 revenue grew by 20% year over year.", {"ticker": "TSLA"})
+        print("Querying:", mem.query_memory("How did Tesla do financially?", where={"ticker": "TSLA"}))
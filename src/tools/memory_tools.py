@@ -1,9 +1,31 @@
+import re
+import threading
+from typing import List, Union
+
 from langchain.tools import tool
 from crewai.tools import tool
-from .memory_store import FinancialMemory
+from .memory_store import FinancialMemory, build_where, finding_metadata
+from .news_pipeline import ingest_news
+
+# One memory instance shared by all tools, opened on first use rather than at
+# import, so importing the agents (the UI, the CLI) neither connects to the
+# vector store nor needs an embedding API key
+_memory_db = None
+_memory_db_lock = threading.Lock()
+
+def get_memory_db() -> FinancialMemory:
+    """
+    The shared memory instance, created by the first caller (thread-safe).
+    """
+    global _memory_db
+    if _memory_db is None:
+        with _memory_db_lock:
+            if _memory_db is None:
+                _memory_db = FinancialMemory()
+    return _memory_db
 
-# Initialize the memory instance globally so all tools share it
-memory_db = FinancialMemory()
+# Kinds of findings agents tag their saves with
+METRIC_TYPES = ['price', 'fundamentals', 'risk', 'news', 'sentiment', 'summary', 'general']
 
 class MemoryTools:
     
@@ -19,21 +41,225 @@ class MemoryTools:
         """       
 
         # We define a metadata dictionary
-        meta = {"source": source}
-        memory_db.save_context(content, meta)
+        meta = finding_metadata(source)
+
+        # BATCHING: Written with the other findings of this run (flushed before any search)
+        try:
+            get_memory_db().buffer_context(content, meta)
+        except Exception as e:
+            return f"Error saving to memory: {str(e)}"
         return "Finding successfully saved to long-term memory."
 
     @tool("Query Shared Memory")
-    def search_memory(query: str):
+    def search_memory(query: str, ticker: str = ""):
         """
         Useful for the Analyst or Reporter Agent.
         Use this tool to search the shared database for previously found facts 
         about a company or topic.
         Args:
             query: The topic you are looking for (e.g. 'Tesla Q3 earnings').
+            ticker: The company's ticker symbol (e.g. 'TSLA'); searches only its findings,
+                which is faster than searching every company.
         """      
 
-        results = memory_db.query_memory(query)
+        try:
+            results = get_memory_db().query_memory(query, where=build_where(ticker=ticker or None))
+        except Exception as e:
+            return f"Error searching memory: {str(e)}"
         if not results:
             return "No relevant information found in memory."
-        return f"Here is what I found in memory:\n{results}"
\ No newline at end of file
+        return f"Here is what I found in memory:\n{results}"
+
+    @tool("Ingest Market News")
+    def ingest_market_news(ticker: str):
+        """
+        Useful for the Researcher Agent.
+        Use this tool to fetch the latest news, commentary and risks for a stock
+        and store them in the shared memory in one step. Articles are cleaned,
+        split into snippets, and syndicated copies of the same story are stored
+        only once.
+        Args:
+            ticker: The stock ticker symbol (e.g. 'TSLA').
+        """
+
+        try:
+            stats = ingest_news(ticker, get_memory_db())
+        except Exception as e:
+            return f"Error ingesting news for '{ticker}': {str(e)}"
+        return (f"Stored {stats['stored']} news snippets from {stats['articles']} articles "
+                f"({stats['duplicate_articles']} duplicate articles and "
+                f"{stats['duplicates']} duplicate snippets skipped).")
+
+class ScopedMemoryTools:
+    """
+    The memory tools bound to one agent of one crew run.
+
+    Every finding is tagged with the ticker, run ID, agent role, metric type
+    and timestamp, and searches are filtered on ticker and run before the
+    vector search, so the reporter only sees findings about the company it
+    is reporting on, from the current run.
+    """
+
+    def __init__(self, agent_role: str, inputs: dict = None, memory: FinancialMemory = None):
+        """
+        Args:
+            agent_role: Role of the agent using the tools (e.g. 'Financial Analyst')
+            inputs: Crew inputs; 'ticker' and 'run_id' scope the tools when present
+            memory: Memory to use (e.g. a per-run scratch memory); defaults to the shared one
+        """
+        inputs = inputs or {}
+        self._memory = memory
+        self.agent_role = agent_role
+        self.ticker = inputs.get("ticker")
+        self.run_id = inputs.get("run_id")
+
+        self.save_finding = self._build_save_finding()
+        self.search_memory = self._build_search_memory()
+        self.search_memory_batch = self._build_search_memory_batch()
+        self.ingest_market_news = self._build_ingest_market_news()
+
+    @property
+    def memory(self) -> FinancialMemory:
+        # Resolved when a tool runs, so building the agents never opens the store
+        return self._memory or get_memory_db()
+
+    def _build_save_finding(self):
+        scope = self
+
+        @tool("Save Finding to Memory")
+        def save_finding(content: str, source: str, metric_type: str = "general"):
+            """
+            Use this tool to save important financial facts, news, or data snippets
+            into the shared memory for other agents to use later.
+            Args:
+                content: The fact or text to remember.
+                source: Where it came from (e.g. 'Yahoo Finance', 'News Article').
+                metric_type: Kind of finding: 'price', 'fundamentals', 'risk', 'news',
+                    'sentiment', 'summary' or 'general'.
+            """
+            metric_type = metric_type.strip().lower() if metric_type else "general"
+            if metric_type not in METRIC_TYPES:
+                metric_type = "general"
+
+            meta = finding_metadata(source, ticker=scope.ticker, run_id=scope.run_id,
+                                    agent_role=scope.agent_role, metric_type=metric_type)
+            try:
+                scope.memory.buffer_context(content, meta)
+            except Exception as e:
+                return f"Error saving to memory: {str(e)}"
+            return "Finding successfully saved to long-term memory."
+
+        return save_finding
+
+    def _build_search_memory(self):
+        scope = self
+
+        @tool("Query Shared Memory")
+        def search_memory(query: str, metric_type: str = "", all_runs: bool = False):
+            """
+            Use this tool to search the shared database for facts saved about
+            the company being analysed. Results come from the current analysis run
+            unless all_runs is True.
+            Args:
+                query: The topic you are looking for (e.g. 'Q3 earnings').
+                metric_type: Optional kind of finding to restrict to: 'price',
+                    'fundamentals', 'risk', 'news', 'sentiment', 'summary' or 'general'.
+                all_runs: Also search findings from earlier runs.
+            """
+            run_id = None if all_runs else scope.run_id
+            try:
+                results = scope.memory.query_memory(query, where=build_where(
+                    ticker=scope.ticker, run_id=run_id, metric_type=metric_type or None))
+
+                # EDGE CASE: Nothing saved in this run yet; earlier findings beat nothing
+                if not results and run_id:
+                    results = scope.memory.query_memory(query, where=build_where(
+                        ticker=scope.ticker, metric_type=metric_type or None))
+                    if results:
+                        return f"Nothing from the current run; from earlier runs I found:\n{results}"
+            except Exception as e:
+                return f"Error searching memory: {str(e)}"
+
+            if not results:
+                return "No relevant information found in memory."
+            return f"Here is what I found in memory:\n{results}"
+
+        return search_memory
+
+    def _build_search_memory_batch(self):
+        scope = self
+
+        @tool("Query Shared Memory (Batch)")
+        def search_memory_batch(queries: Union[List[str], str], metric_type: str = "", all_runs: bool = False):
+            """
+            Use this tool to gather everything you need from the shared database in
+            one call: pass all your questions about the company being analysed at
+            once (e.g. ['P/E ratio', 'latest news', 'key risks']) and get the
+            findings grouped per question. Results come from the current analysis
+            run unless all_runs is True.
+            Args:
+                queries: The topics you are looking for, as a list (or one per line).
+                metric_type: Optional kind of finding to restrict to: 'price',
+                    'fundamentals', 'risk', 'news', 'sentiment', 'summary' or 'general'.
+                all_runs: Also search findings from earlier runs.
+            """
+            # EDGE CASE: Agents sometimes pass the list as one string
+            if isinstance(queries, str):
+                queries = re.split(r'[\n;]+', queries)
+            queries = [q.strip() for q in queries if q and q.strip()]
+            if not queries:
+                return "Please pass at least one query."
+
+            run_id = None if all_runs else scope.run_id
+            try:
+                results = scope.memory.query_many(queries, where=build_where(
+                    ticker=scope.ticker, run_id=run_id, metric_type=metric_type or None))
+
+                # EDGE CASE: Questions with nothing from this run fall back to earlier runs, in one more batch
+                missing = [q for q, r in zip(queries, results) if not r]
+                earlier = {}
+                if missing and run_id:
+                    earlier = dict(zip(missing, scope.memory.query_many(missing, where=build_where(
+                        ticker=scope.ticker, metric_type=metric_type or None))))
+            except Exception as e:
+                return f"Error searching memory: {str(e)}"
+
+            sections = []
+            for query, result in zip(queries, results):
+                if result:
+                    body = result
+                elif earlier.get(query):
+                    body = f"(Nothing from the current run; from earlier runs)\n{earlier[query]}"
+                else:
+                    body = "No relevant information found in memory."
+                sections.append(f"### {query}\n{body}")
+            return "\n\n".join(sections)
+
+        return search_memory_batch
+
+    def _build_ingest_market_news(self):
+        scope = self
+
+        @tool("Ingest Market News")
+        def ingest_market_news(ticker: str):
+            """
+            Use this tool to fetch the latest news, commentary and risks for a stock
+            and store them in the shared memory in one step. Articles are cleaned,
+            split into snippets, and syndicated copies of the same story are stored
+            only once.
+            Args:
+                ticker: The stock ticker symbol (e.g. 'TSLA').
+            """
+            metadata = {"agent_role": scope.agent_role}
+            if scope.run_id:
+                metadata["run_id"] = scope.run_id
+
+            try:
+                stats = ingest_news(ticker, scope.memory, metadata=metadata)
+            except Exception as e:
+                return f"Error ingesting news for '{ticker}': {str(e)}"
+            return (f"Stored {stats['stored']} news snippets from {stats['articles']} articles "
+                    f"({stats['duplicate_articles']} duplicate articles and "
+                    f"{stats['duplicates']} duplicate snippets skipped).")
+
+        return ingest_market_news
@@ -0,0 +1,242 @@
+"""Streaming news ingestion: fetch, clean, chunk, drop near-duplicates, then store in batches."""
+
+import hashlib
+import html
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .web_search import search_cache
+
+# Queries run for a ticker unless the caller passes its own
+NEWS_QUERIES = [
+    "latest market news for stock {ticker}",
+    "{ticker} stock analyst commentary and sentiment",
+    "{ticker} risks and upcoming events",
+]
+
+# Chunk size in words, with some overlap so a sentence cut at a boundary survives in one chunk
+CHUNK_WORDS = 120
+CHUNK_OVERLAP = 20
+
+# Chunks shorter than this (navigation crumbs, bylines, ...) are not worth embedding
+MIN_CHUNK_WORDS = 12
+
+# Two texts whose 64-bit SimHash fingerprints differ in at most this many bits are near-duplicates
+MAX_HAMMING_DISTANCE = 6
+
+# Chunks embedded and stored per memory write
+BATCH_SIZE = 32
+
+
+# ---- Stages ----------------------------------------------------------------
+
+def fetch_articles(queries: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield search results for each query (served from the search cache when fresh)."""
+    for query in queries:
+        for result in search_cache.search(query).get('results', []):
+            yield result
+
+
+def clean_text(text: str) -> str:
+    """
+    Strip markup and boilerplate from an article snippet.
+
+    Removes HTML tags and entities, markdown links/images/headings/emphasis,
+    bare URLs and repeated whitespace.
+    """
+    text = html.unescape(text or '')
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = re.sub(r'!\[[^\]]*\]\([^)]*\)', ' ', text)
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'https?://\S+', ' ', text)
+    text = re.sub(r'^[#>*\-\s]+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[*_`]{1,3}', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def chunk_text(text: str, size: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> Iterator[str]:
+    """Split text into overlapping windows of `size` words."""
+    words = text.split()
+    step = max(1, size - overlap)
+    for start in range(0, len(words), step):
+        chunk = words[start:start + size]
+        if len(chunk) >= MIN_CHUNK_WORDS:
+            yield ' '.join(chunk)
+        if start + size >= len(words):
+            break
+
+
+def simhash(text: str, bits: int = 64) -> int:
+    """
+    SimHash fingerprint of a text over word 3-gram shingles.
+
+    Syndicated copies of a story (same text, different boilerplate or a few
+    edited words) get fingerprints within a few bits of each other.
+    """
+    words = re.findall(r'\w+', text.lower())
+    shingles = [' '.join(words[i:i + 3]) for i in range(max(1, len(words) - 2))]
+
+    weights = [0] * bits
+    for shingle in shingles:
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(bits):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+
+    return sum(1 << bit for bit in range(bits) if weights[bit] > 0)
+
+
+class NearDuplicateFilter:
+    """
+    Remembers SimHash fingerprints and flags texts close to one already seen.
+
+    Fingerprints are indexed by eight 8-bit bands: two fingerprints within 7
+    bits of each other share at least one band exactly, so only the
+    fingerprints in matching buckets are compared. The oldest fingerprints
+    are forgotten beyond `capacity`.
+    """
+
+    BANDS = 8
+
+    def __init__(self, max_distance: int = MAX_HAMMING_DISTANCE, capacity: int = 50000):
+        self.max_distance = max_distance
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._order = deque()
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+
+    def _bands(self, fingerprint: int) -> List[Tuple[int, int]]:
+        return [(band, fingerprint >> (8 * band) & 0xFF) for band in range(self.BANDS)]
+
+    def _forget(self, fingerprint: int):
+        for band in self._bands(fingerprint):
+            bucket = self._buckets.get(band)
+            if bucket and fingerprint in bucket:
+                bucket.remove(fingerprint)
+                if not bucket:
+                    del self._buckets[band]
+
+    def is_near(self, fingerprint: int, other: int) -> bool:
+        return bin(fingerprint ^ other).count('1') <= self.max_distance
+
+    def duplicate(self, fingerprint: int) -> bool:
+        """Whether a fingerprint is close to a remembered one (without remembering it)."""
+        with self._lock:
+            return any(self.is_near(fingerprint, other)
+                       for band in self._bands(fingerprint)
+                       for other in self._buckets.get(band, ()))
+
+    def remember(self, fingerprints: Iterable[int]):
+        """Remember fingerprints, e.g. once their texts are safely stored."""
+        with self._lock:
+            for fingerprint in fingerprints:
+                for band in self._bands(fingerprint):
+                    self._buckets.setdefault(band, []).append(fingerprint)
+                self._order.append(fingerprint)
+                if len(self._order) > self.capacity:
+                    self._forget(self._order.popleft())
+
+    def seen(self, text: str) -> bool:
+        """
+        Check a text against the remembered ones, remembering it if it is new.
+
+        Returns:
+            True if a near-duplicate was seen before
+        """
+        fingerprint = simhash(text)
+        if self.duplicate(fingerprint):
+            return True
+        self.remember([fingerprint])
+        return False
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group a stream into lists of `size` items (the last one may be shorter)."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---- Pipeline ----------------------------------------------------------------
+
+def ingest_news(ticker: str, memory, queries: List[str] = None, batch_size: int = BATCH_SIZE,
+                metadata: Dict[str, Any] = None) -> Dict[str, int]:
+    """
+    Stream news for a ticker into memory, storing each distinct chunk once.
+
+    fetch -> clean -> article near-duplicate filter -> chunk -> chunk
+    near-duplicate filter -> batched save. Every stage is a generator, so
+    chunks reach memory while later queries are still being processed.
+
+    Syndicated copies are dropped as whole articles first: a different
+    byline or intro shifts every fixed-size chunk window, so the chunks of
+    two copies rarely line up, while the fingerprints of the full texts
+    stay within a few bits. The per-chunk check then catches passages
+    shared by otherwise different articles.
+
+    Both near-duplicate filters only span this call (copies across the
+    queries). Chunks stored by earlier ingestions are recognised by
+    save_many() through their content IDs instead, which also tags them with
+    this run's metadata so run-scoped searches still find them.
+
+    Args:
+        ticker: Stock ticker symbol
+        memory: FinancialMemory to store the chunks in (via save_many(), which skips chunks already stored)
+        queries: Search queries ('{ticker}' is substituted); defaults to NEWS_QUERIES
+        batch_size: Chunks embedded and stored per write
+        metadata: Extra metadata recorded on every chunk (e.g. run_id, agent_role)
+
+    Returns:
+        Counts of articles, near-duplicate articles dropped, chunks,
+        near-duplicate chunks dropped and new chunks stored
+    """
+    ticker = ticker.strip().upper()
+    queries = [q.format(ticker=ticker) for q in (queries or NEWS_QUERIES)]
+    stats = {'articles': 0, 'duplicate_articles': 0, 'chunks': 0, 'duplicates': 0, 'stored': 0}
+    seen_articles = NearDuplicateFilter()
+    seen = NearDuplicateFilter()
+
+    # Fingerprints of chunks not stored yet: compared against, but only
+    # remembered by the filter once their batch is saved
+    unsaved = []
+
+    def chunks():
+        for article in fetch_articles(queries):
+            stats['articles'] += 1
+            text = clean_text(article.get('content', ''))
+            # DEDUPLICATION: the same story from another outlet is skipped before chunking
+            if seen_articles.seen(text):
+                stats['duplicate_articles'] += 1
+                continue
+            for chunk in chunk_text(text):
+                stats['chunks'] += 1
+                fingerprint = simhash(chunk)
+                if seen.duplicate(fingerprint) or any(seen.is_near(fingerprint, other) for other in unsaved):
+                    stats['duplicates'] += 1
+                    continue
+                unsaved.append(fingerprint)
+                yield chunk, fingerprint, dict(
+                    metadata or {},
+                    source=article.get('url', '') or 'web search',
+                    title=article.get('title', ''),
+                    ticker=ticker,
+                    metric_type='news',
+                    timestamp=time.time(),
+                )
+
+    for batch in batched(chunks(), batch_size):
+        texts, fingerprints, metadatas = zip(*batch)
+        stats['stored'] += memory.save_many(list(texts), list(metadatas))
+        seen.remember(fingerprints)
+        del unsaved[:len(fingerprints)]
+
+    print(f"📰 Ingested news for {ticker}: {stats['stored']} chunks stored, "
+          f"{stats['duplicate_articles']} duplicate articles and {stats['duplicates']} duplicate chunks dropped")
+    return stats
@@ -0,0 +1,79 @@
+"""Deterministic pre-fetch of the data the crew tasks need, run in code before kickoff."""
+
+import asyncio
+import json
+from typing import Any, Dict
+
+from .financial_tools import get_market_data, get_price_history, get_risk_metrics, get_stock_overview
+from .market_data import run_coroutine
+
+# Upper bound on the news excerpt placed in the brief
+NEWS_BRIEF_CHARS = 1500
+
+
+def _compact(value: Any) -> str:
+    """Render a tool result as compact single-line JSON (error strings stay as they are)."""
+    if isinstance(value, Exception):
+        return f"unavailable ({value})"
+    if isinstance(value, str):
+        return value.strip()
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def _slim_ratios(overview: Any) -> Any:
+    """Keep each ratio's value and source, dropping the 'basis' explanation to save tokens."""
+    if not isinstance(overview, dict) or 'ratios' not in overview:
+        return overview
+    ratios = {name: [r['value'], r['source']] for name, r in overview['ratios'].items()}
+    return dict(overview, ratios=ratios)
+
+
+async def aprefetch_ticker_data(ticker: str) -> Dict[str, Any]:
+    """
+    Run the data tools a report needs for a ticker, all in parallel.
+
+    Args:
+        ticker: Stock ticker symbol
+
+    Returns:
+        {'overview', 'price_history', 'risk_metrics', 'market_data'}; a part that
+        failed holds the exception (tools already turn most errors into strings)
+    """
+    ticker = ticker.strip().upper()
+    overview, history, risk, news = await asyncio.gather(
+        asyncio.to_thread(get_stock_overview.func, ticker),
+        asyncio.to_thread(get_price_history.func, ticker),
+        asyncio.to_thread(get_risk_metrics.func, ticker),
+        asyncio.to_thread(get_market_data.func, ticker),
+        return_exceptions=True,
+    )
+    return {'overview': overview, 'price_history': history, 'risk_metrics': risk, 'market_data': news}
+
+
+def build_data_brief(ticker: str) -> Dict[str, str]:
+    """
+    Pre-fetch a ticker's data and render it as compact briefs for the task prompts.
+
+    Every tool result is also left in the caches, so a tool call an agent still
+    makes is answered locally.
+
+    Args:
+        ticker: Stock ticker symbol
+
+    Returns:
+        {'financial': ..., 'news': ...} brief texts
+    """
+    data = run_coroutine(aprefetch_ticker_data(ticker))
+
+    financial = "\n".join([
+        f"overview: {_compact(_slim_ratios(data['overview']))}",
+        "ratios format: [value, source]",
+        f"price_history: {_compact(data['price_history'])}",
+        f"risk_metrics: {_compact(data['risk_metrics'])}",
+    ])
+
+    news = _compact(data['market_data'])
+    if len(news) > NEWS_BRIEF_CHARS:
+        news = news[:NEWS_BRIEF_CHARS].rsplit(' ', 1)[0] + " ..."
+
+    return {'financial': financial, 'news': news}
@@ -0,0 +1,263 @@
+"""Incremental, append-only local store of daily OHLCV price history."""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from config.settings import get_cache_config
+from .http_clients import clients
+from .rate_limiter import call_provider
+from .replay import replay_store
+
+# One flat binary file per column; dates are stored as int64 days since 1970-01-01.
+# 'close' is the traded close, 'adj_close' is adjusted for splits and dividends
+# (what return and risk calculations need)
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adj_close', 'volume')
+YAHOO_COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close',
+                 'adj_close': 'Adj Close', 'volume': 'Volume'}
+
+# Columns of stores written before 'adj_close' was added
+LEGACY_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Corporate actions that re-base stored history: a split changes every past
+# price, a dividend every past adjusted close
+REBASING_ACTIONS = ('Stock Splits', 'Dividends')
+
+
+class PriceHistoryStore:
+    """
+    Columnar daily price store, one directory per ticker.
+
+    Each column is a raw float64 file that only ever grows; sync() downloads
+    the sessions missing since the last stored date and appends them. The row
+    count in meta.json is the commit point, so a crashed append is ignored and
+    overwritten by the next one. Readers get read-only memory-mapped slices,
+    i.e. years of history without copying or re-downloading it.
+
+    A rebuild (after a split or dividend) never rewrites files in place: it writes a new
+    generation of column files and switches meta.json to it, so a reader
+    still mapping the previous generation keeps valid data.
+
+    Only completed sessions (before today) are stored, so a partial intraday
+    bar never gets frozen into the history.
+    """
+
+    def __init__(self, root: str = None, initial_period: str = None, sync_interval: int = None):
+        """
+        Args:
+            root: Directory holding the per-ticker column files (defaults to PRICE_STORE_PATH)
+            initial_period: How much history to download the first time a ticker is synced
+            sync_interval: Seconds during which a synced ticker is not checked again
+        """
+        config = get_cache_config()
+        self.root = root or config['price_store_path']
+        self.initial_period = initial_period or config['price_store_initial_period']
+        self.sync_interval = config['history_ttl'] if sync_interval is None else sync_interval
+        self._lock = threading.Lock()
+
+    # ---- File layout -------------------------------------------------------
+
+    def _dir(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker)
+
+    def _path(self, ticker: str, column: str, generation: int = 0) -> str:
+        suffix = 'i8' if column == 'date' else 'f8'
+        # Generation 0 keeps the original file names, so existing stores stay readable
+        name = f"{column}.{suffix}" if generation == 0 else f"{column}.{generation}.{suffix}"
+        return os.path.join(self._dir(ticker), name)
+
+    def _read_meta(self, ticker: str) -> Dict:
+        try:
+            with open(os.path.join(self._dir(ticker), 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            meta = {'rows': 0, 'synced_at': 0.0}
+        meta.setdefault('generation', 0)
+        return meta
+
+    def _write_meta(self, ticker: str, meta: Dict):
+        path = os.path.join(self._dir(ticker), 'meta.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
+
+    def _column(self, ticker: str, column: str, rows: int, generation: int = 0) -> np.ndarray:
+        dtype = np.int64 if column == 'date' else np.float64
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._path(ticker, column, generation), dtype=dtype, mode='r', shape=(rows,))
+
+    # ---- Writing -------------------------------------------------------------
+
+    def rows(self, ticker: str) -> int:
+        """Number of committed daily rows stored for a ticker."""
+        return self._read_meta(ticker)['rows']
+
+    def last_date(self, ticker: str) -> Optional[np.datetime64]:
+        """Date of the most recent stored session, or None if nothing is stored."""
+        meta = self._read_meta(ticker)
+        if meta['rows'] == 0:
+            return None
+        return np.datetime64(int(self._column(ticker, 'date', meta['rows'], meta['generation'])[-1]), 'D')
+
+    def append(self, ticker: str, dates: np.ndarray, columns: Dict[str, np.ndarray], reset: bool = False):
+        """
+        Append new sessions to a ticker's history.
+
+        Args:
+            ticker: Stock or index symbol
+            dates: Session dates (datetime64[D]), strictly after the last stored date
+            columns: Arrays for every name in PRICE_COLUMNS, aligned with dates
+            reset: Replace the stored history instead of appending to it
+        """
+        os.makedirs(self._dir(ticker), exist_ok=True)
+        meta = self._read_meta(ticker)
+        previous = meta['generation']
+        rows = meta['rows']
+        if reset:
+            # Readers may have the current files mapped: write a fresh generation instead
+            meta['generation'] = previous + 1
+            rows = 0
+
+        data = {'date': np.asarray(dates, dtype='datetime64[D]').astype(np.int64)}
+        data.update({c: np.asarray(columns[c], dtype=np.float64) for c in PRICE_COLUMNS})
+
+        for column, values in data.items():
+            path = self._path(ticker, column, meta['generation'])
+            with open(path, 'r+b' if os.path.exists(path) and not reset else 'wb') as f:
+                # Anything past the committed row count is a leftover of a failed append
+                f.seek(rows * values.itemsize)
+                f.write(values.tobytes())
+                f.truncate()
+
+        meta['rows'] = rows + len(data['date'])
+        meta['columns'] = list(PRICE_COLUMNS)
+        self._write_meta(ticker, meta)
+
+        if reset:
+            # Unlinking leaves open mappings intact (POSIX); where the OS refuses
+            # (Windows, while mapped) the old files are simply left behind
+            for column in data:
+                try:
+                    os.remove(self._path(ticker, column, previous))
+                except OSError:
+                    pass
+
+    def sync(self, ticker: str, force: bool = False) -> int:
+        """
+        Download and append the sessions missing since the last sync.
+
+        Args:
+            ticker: Stock or index symbol (uppercase)
+            force: Check Yahoo even if the ticker was synced recently
+
+        Returns:
+            Number of rows appended
+        """
+        # Replayed runs must stay offline; they read whatever history is stored
+        if replay_store.mode == 'replay':
+            return 0
+
+        with self._lock:
+            meta = self._read_meta(ticker)
+            if not force and time.time() - meta.get('synced_at', 0) < self.sync_interval:
+                return 0
+
+            last = self.last_date(ticker)
+            today = np.datetime64('today', 'D')
+            # A store missing columns (written by an older version) is downloaded again in full
+            outdated = last is not None and meta.get('columns', LEGACY_COLUMNS) != list(PRICE_COLUMNS)
+            if last is not None and last + 1 >= today and not outdated:
+                self._touch(ticker)
+                return 0
+
+            stock = clients.yahoo_ticker(ticker)
+            if last is None or outdated:
+                history = call_provider('yfinance', lambda: stock.history(
+                    period=self.initial_period, auto_adjust=False, actions=True))
+            else:
+                history = call_provider('yfinance', lambda: stock.history(
+                    start=str(last + 1), auto_adjust=False, actions=True))
+
+            if history.empty:
+                self._touch(ticker)
+                return 0
+
+            # A split or dividend re-bases stored prices, so the history has to be rebuilt
+            rebased = last is not None and not outdated and any(
+                action in history and (history[action] != 0).any() for action in REBASING_ACTIONS)
+            if rebased:
+                history = call_provider('yfinance', lambda: stock.history(
+                    period=self.initial_period, auto_adjust=False, actions=True))
+            reset = outdated or rebased
+
+            dates = np.array(history.index.strftime('%Y-%m-%d'), dtype='datetime64[D]')
+            keep = dates < today
+            if last is not None and not reset:
+                keep &= dates > last
+
+            if keep.any():
+                # EDGE CASE: Some yfinance versions leave out 'Adj Close' when there is nothing to adjust
+                columns = {c: history.get(YAHOO_COLUMNS[c], history['Close']).to_numpy()[keep]
+                           for c in PRICE_COLUMNS}
+                self.append(ticker, dates[keep], columns, reset=reset)
+
+            self._touch(ticker)
+            return int(keep.sum())
+
+    def _touch(self, ticker: str):
+        os.makedirs(self._dir(ticker), exist_ok=True)
+        meta = self._read_meta(ticker)
+        meta['synced_at'] = time.time()
+        self._write_meta(ticker, meta)
+
+    # ---- Reading -------------------------------------------------------------
+
+    def read(self, ticker: str, start: str = None, end: str = None) -> Dict[str, np.ndarray]:
+        """
+        Zero-copy view of a ticker's stored history.
+
+        Args:
+            ticker: Stock or index symbol (uppercase)
+            start: First date to include (ISO string, inclusive)
+            end: Last date to include (ISO string, inclusive)
+
+        Returns:
+            {'date': datetime64[D] array, 'open', 'high', 'low', 'close', 'adj_close',
+            'volume'}, all read-only memory-mapped slices of the same length
+        """
+        # EDGE CASE: A rebuild can switch generations (and remove the old files)
+        # between reading meta.json and mapping the files; map the new ones then
+        for attempt in range(2):
+            meta = self._read_meta(ticker)
+            stored = meta.get('columns', LEGACY_COLUMNS)
+            try:
+                # EDGE CASE: Stores not yet rebuilt with adjusted closes (replayed runs
+                # never sync) serve the traded close in their place
+                mapped = {c: self._column(ticker, c if c == 'date' or c in stored else 'close',
+                                          meta['rows'], meta['generation'])
+                          for c in ('date', *PRICE_COLUMNS)}
+                break
+            except FileNotFoundError:
+                if attempt:
+                    raise
+
+        dates = mapped['date']
+        lo, hi = 0, meta['rows']
+        if start is not None:
+            lo = int(np.searchsorted(dates, np.datetime64(start, 'D').astype(np.int64), side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(dates, np.datetime64(end, 'D').astype(np.int64), side='right'))
+
+        result = {'date': dates[lo:hi].view('datetime64[D]')}
+        for column in PRICE_COLUMNS:
+            result[column] = mapped[column][lo:hi]
+        return result
+
+
+# Shared by every tool in the process
+price_store = PriceHistoryStore()
@@ -0,0 +1,69 @@
+"""Field projection and size budgeting for tool outputs that are sent to the LLM."""
+
+import json
+from typing import Any, Dict, List
+
+
+def payload_size(payload: Any) -> int:
+    """Size in bytes of a payload once serialised the way the LLM will see it."""
+    return len(json.dumps(payload, default=str).encode('utf-8'))
+
+
+def estimate_tokens(payload: Any) -> int:
+    """
+    Estimate how many prompt tokens a payload costs.
+
+    Uses tiktoken when it is installed (it ships with crewAI) and falls back to
+    the usual ~4 bytes per token rule of thumb otherwise.
+
+    Args:
+        payload: A string or any JSON-serialisable value
+
+    Returns:
+        Approximate token count
+    """
+    text = payload if isinstance(payload, str) else json.dumps(payload, default=str)
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    except ImportError:
+        return max(1, len(text.encode('utf-8')) // 4)
+
+
+def project_fields(payload: Dict[str, Any], fields: List[str] = None, max_bytes: int = None) -> Dict[str, Any]:
+    """
+    Keep only the requested fields of a payload, within a byte budget.
+
+    Fields are kept in priority order (the order of `fields`, or the payload's own
+    order); once the budget is reached the remaining fields are dropped and listed
+    under 'omitted_fields' so the agent knows it can ask for them explicitly.
+
+    Args:
+        payload: The full dictionary
+        fields: Keys to keep, most important first (defaults to all keys)
+        max_bytes: Maximum serialised size of the result (None for no limit)
+
+    Returns:
+        The projected dictionary
+    """
+    fields = fields if fields is not None else list(payload.keys())
+
+    projected = {}
+    omitted = []
+    for field in fields:
+        if field not in payload:
+            continue
+        if omitted:
+            omitted.append(field)
+            continue
+
+        candidate = dict(projected, **{field: payload[field]})
+        if max_bytes is not None and projected and payload_size(candidate) > max_bytes:
+            omitted.append(field)
+            continue
+        projected = candidate
+
+    if omitted:
+        projected['omitted_fields'] = omitted
+
+    return projected
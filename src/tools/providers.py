@@ -0,0 +1,328 @@
+"""Pluggable market data providers and the tiered policy that chooses between them."""
+
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import get_cache_config, get_provider_config
+from .fundamentals import statement_to_dict
+from .http_clients import clients
+from .rate_limiter import call_provider
+from .replay import replayable
+
+# Kinds of data a provider can serve
+DATA_KINDS = ('quote', 'info', 'statements')
+
+# (value, as_of) where as_of is the epoch time the data was observed
+Observation = Tuple[Any, float]
+
+
+class MarketDataProvider:
+    """
+    Interface of a market data source.
+
+    Each getter returns (value, as_of) or None when the provider has nothing
+    for the ticker; raising means the provider failed. Values use the yfinance
+    shapes: a quote is {'price', 'currency'}, info is the .info dictionary and
+    statements are {'income': {...}, 'balance': {...}}.
+    """
+
+    name = 'base'
+
+    def get_quote(self, ticker: str) -> Optional[Observation]:
+        return None
+
+    def get_info(self, ticker: str) -> Optional[Observation]:
+        return None
+
+    def get_statements(self, ticker: str) -> Optional[Observation]:
+        return None
+
+
+# ---- Yahoo Finance -----------------------------------------------------------
+
+@replayable('yfinance', 'quote')
+def _yahoo_quote(ticker: str) -> Optional[Dict[str, Any]]:
+    def _fetch():
+        fast_info = clients.yahoo_ticker(ticker).fast_info
+        return fast_info.get('lastPrice'), fast_info.get('currency')
+
+    price, currency = call_provider('yfinance', _fetch)
+
+    # EDGE CASE: Unknown tickers come back as None or NaN instead of raising
+    if price is None or (isinstance(price, float) and math.isnan(price)):
+        return None
+
+    return {'price': float(price), 'currency': currency or 'USD'}
+
+
+@replayable('yfinance', 'info')
+def _yahoo_info(ticker: str) -> Dict[str, Any]:
+    return call_provider('yfinance', lambda: clients.yahoo_ticker(ticker).info)
+
+
+@replayable('yfinance', 'statements')
+def _yahoo_statements(ticker: str) -> Dict[str, Any]:
+    stock = clients.yahoo_ticker(ticker)
+    return {
+        'income': statement_to_dict(call_provider('yfinance', lambda: stock.income_stmt)),
+        'balance': statement_to_dict(call_provider('yfinance', lambda: stock.balance_sheet)),
+    }
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live Yahoo Finance data (rate limited, replayable)."""
+
+    name = 'yfinance'
+
+    def get_quote(self, ticker: str) -> Optional[Observation]:
+        quote = _yahoo_quote(ticker)
+        return (quote, time.time()) if quote else None
+
+    def get_info(self, ticker: str) -> Optional[Observation]:
+        info = _yahoo_info(ticker)
+        return (info, time.time()) if info else None
+
+    def get_statements(self, ticker: str) -> Optional[Observation]:
+        statements = _yahoo_statements(ticker)
+        return (statements, time.time()) if statements['income']['items'] else None
+
+
+# ---- Local snapshot ------------------------------------------------------------
+
+class LocalSnapshotProvider(MarketDataProvider):
+    """
+    Serves data from a local snapshot directory, typically refreshed nightly.
+
+    Layout (see build_snapshot()):
+    - quotes.parquet or quotes.csv: one row per ticker with 'price' and 'currency'
+    - info.parquet or info.csv: one row per ticker with scalar .info fields
+    - statements/<TICKER>.json: statements in the same shape as the live provider
+
+    A file's modification time is the as_of of everything it contains.
+    """
+
+    name = 'snapshot'
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Tuple[float, pd.DataFrame]] = {}
+
+    def _table(self, name: str) -> Optional[Tuple[pd.DataFrame, float]]:
+        for suffix, reader in (('.parquet', pd.read_parquet), ('.csv', pd.read_csv)):
+            path = os.path.join(self.root, name + suffix)
+            if not os.path.exists(path):
+                continue
+
+            mtime = os.path.getmtime(path)
+            with self._lock:
+                cached = self._tables.get(name)
+                if cached is None or cached[0] != mtime:
+                    frame = reader(path)
+                    frame['ticker'] = frame['ticker'].astype(str).str.upper()
+                    cached = self._tables[name] = (mtime, frame.set_index('ticker'))
+            return cached[1], mtime
+        return None
+
+    def _row(self, name: str, ticker: str) -> Optional[Observation]:
+        table = self._table(name)
+        if table is None or ticker not in table[0].index:
+            return None
+        values = {}
+        for key, value in table[0].loc[ticker].to_dict().items():
+            value = value.item() if hasattr(value, 'item') else value
+            values[key] = None if isinstance(value, float) and math.isnan(value) else value
+        return values, table[1]
+
+    def get_quote(self, ticker: str) -> Optional[Observation]:
+        row = self._row('quotes', ticker)
+        if row is None or row[0].get('price') is None:
+            return None
+        values, as_of = row
+        return {'price': float(values['price']), 'currency': values.get('currency') or 'USD'}, as_of
+
+    def get_info(self, ticker: str) -> Optional[Observation]:
+        row = self._row('info', ticker)
+        if row is None:
+            return None
+        values, as_of = row
+        return {k: v for k, v in values.items() if v is not None}, as_of
+
+    def get_statements(self, ticker: str) -> Optional[Observation]:
+        path = os.path.join(self.root, 'statements', f"{ticker}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f), os.path.getmtime(path)
+
+
+def build_snapshot(tickers: List[str], root: str = None):
+    """
+    Write a local snapshot of quotes, info and statements for the given tickers.
+
+    Meant to run as a nightly job so that daytime runs are served locally.
+    Writes Parquet when pyarrow is installed and CSV otherwise.
+
+    Args:
+        tickers: Ticker symbols to snapshot
+        root: Snapshot directory (defaults to MARKET_SNAPSHOT_PATH)
+    """
+    root = root or get_provider_config()['snapshot_path']
+    os.makedirs(os.path.join(root, 'statements'), exist_ok=True)
+    live = YFinanceProvider()
+
+    quotes, infos = [], []
+    for ticker in tickers:
+        ticker = ticker.strip().upper()
+        quote = live.get_quote(ticker)
+        if quote:
+            quotes.append(dict(quote[0], ticker=ticker))
+
+        info = live.get_info(ticker)
+        if info:
+            # Tables only hold scalar fields (officers, lists, ... stay live-only)
+            scalars = {k: v for k, v in info[0].items() if isinstance(v, (str, int, float, bool))}
+            infos.append(dict(scalars, ticker=ticker))
+
+        statements = live.get_statements(ticker)
+        if statements:
+            with open(os.path.join(root, 'statements', f"{ticker}.json"), 'w', encoding='utf-8') as f:
+                json.dump(statements[0], f)
+
+    for name, rows in (('quotes', quotes), ('info', infos)):
+        frame = pd.DataFrame(rows)
+        try:
+            frame.to_parquet(os.path.join(root, name + '.parquet'), index=False)
+        except ImportError:
+            frame.to_csv(os.path.join(root, name + '.csv'), index=False)
+
+    print(f"📦 Snapshot written for {len(infos)} tickers to {root}")
+
+
+# ---- Financial Datasets (stub) ----------------------------------------------------
+
+class FinancialDatasetsProvider(MarketDataProvider):
+    """
+    Placeholder for the Financial Datasets API named in the PRD.
+
+    Not implemented yet: every getter returns None so the tiering policy moves
+    on to the next provider. Enable it in MARKET_DATA_PROVIDERS once the API
+    calls are written.
+    """
+
+    name = 'financial_datasets'
+
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key
+
+
+# ---- Tiering ---------------------------------------------------------------
+
+class TieredProvider:
+    """
+    Tries providers in order and returns the first fresh answer.
+
+    A provider's answer is skipped when it is older than the freshness of that
+    kind of data (the market cache TTLs), when the provider has nothing, when
+    it raises, or when it does not answer within the timeout. Put the fastest
+    source (the local snapshot) first and the network last.
+    """
+
+    def __init__(self, providers: List[MarketDataProvider], timeout: float, max_age: Dict[str, float]):
+        self.providers = providers
+        self.timeout = timeout
+        self.max_age = max_age
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='provider')
+        self._lock = threading.Lock()
+        self._stats = {p.name: {'served': 0, 'stale': 0, 'empty': 0, 'errors': 0, 'timeouts': 0} for p in providers}
+
+    def _count(self, provider: str, key: str):
+        with self._lock:
+            self._stats[provider][key] += 1
+
+    def fetch(self, kind: str, ticker: str) -> Optional[Any]:
+        """
+        Return the freshest available value of a kind of data for a ticker.
+
+        Args:
+            kind: 'quote', 'info' or 'statements'
+            ticker: Stock ticker symbol (uppercase)
+
+        Returns:
+            The value, or None if no provider has it
+
+        Raises:
+            Exception: The last provider error, if every provider failed
+        """
+        last_error = None
+        for index, provider in enumerate(self.providers):
+            getter = getattr(provider, f"get_{kind}")
+            try:
+                # The last tier gets all the time it needs; there is nothing to fall back to
+                if index == len(self.providers) - 1:
+                    observation = getter(ticker)
+                else:
+                    observation = self._pool.submit(getter, ticker).result(timeout=self.timeout)
+            except FutureTimeoutError:
+                self._count(provider.name, 'timeouts')
+                continue
+            except Exception as e:
+                self._count(provider.name, 'errors')
+                last_error = e
+                continue
+
+            if observation is None:
+                self._count(provider.name, 'empty')
+                continue
+
+            value, as_of = observation
+            if time.time() - as_of > self.max_age[kind]:
+                self._count(provider.name, 'stale')
+                continue
+
+            self._count(provider.name, 'served')
+            return value
+
+        if last_error is not None:
+            raise last_error
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-provider counts of answers served, skipped as stale or empty, errors and timeouts."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._stats.items()}
+
+
+def build_tiered_provider() -> TieredProvider:
+    """Build the tiered provider from MARKET_DATA_PROVIDERS and the cache freshness rules."""
+    config = get_provider_config()
+    cache_config = get_cache_config()
+
+    available = {
+        'snapshot': lambda: LocalSnapshotProvider(config['snapshot_path']),
+        'yfinance': YFinanceProvider,
+        'financial_datasets': lambda: FinancialDatasetsProvider(config['financial_datasets_api_key']),
+    }
+
+    providers = []
+    for name in config['providers']:
+        if name not in available:
+            raise ValueError(f"Unknown market data provider '{name}'. Choose from: {', '.join(available)}")
+        providers.append(available[name]())
+
+    max_age = {
+        'quote': cache_config['quote_ttl'],
+        'info': cache_config['info_ttl'],
+        'statements': cache_config['info_ttl'],
+    }
+    return TieredProvider(providers, timeout=config['provider_timeout'], max_age=max_age)
+
+
+market_providers = build_tiered_provider()
@@ -0,0 +1,82 @@
+"""Lightweight quote engine: last price plus a locally cached display name in one request."""
+
+from typing import Any, Dict, Optional
+
+from .data_cache import DataCache, market_cache
+from .providers import market_providers
+
+# Display names for the tickers suggested on the welcome screen, so the common
+# case never needs the heavy .info request just to label a price.
+KNOWN_NAMES = {
+    'AAPL': 'Apple Inc.',
+    'TSLA': 'Tesla, Inc.',
+    'MSFT': 'Microsoft Corporation',
+    'GOOGL': 'Alphabet Inc.',
+    'AMZN': 'Amazon.com, Inc.',
+    'NVDA': 'NVIDIA Corporation',
+    'META': 'Meta Platforms, Inc.',
+}
+
+
+class QuoteEngine:
+    """
+    Fetches the last traded price (through yfinance's fast_info endpoint unless
+    a faster provider tier has a fresh quote).
+
+    The company name comes from a local name table (built-in names, then names
+    learned from earlier .info lookups), so a price lookup costs a single request.
+    """
+
+    def __init__(self, cache: DataCache = market_cache):
+        self.cache = cache
+
+    def display_name(self, ticker: str) -> str:
+        """
+        Resolve a display name without touching the network.
+
+        Args:
+            ticker: Stock ticker symbol (uppercase)
+
+        Returns:
+            The best known short name, or the ticker itself
+        """
+        if ticker in KNOWN_NAMES:
+            return KNOWN_NAMES[ticker]
+
+        name = self.cache.get(ticker, 'name')
+        if name:
+            return name
+
+        return ticker
+
+    def remember_name(self, ticker: str, info: Dict[str, Any]):
+        """Record the short name from an .info payload in the local name table."""
+        name = info.get('shortName') or info.get('longName')
+        if name:
+            self.cache.set(ticker, 'name', name)
+
+    def get_quote(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the latest quote for a ticker, served from the cache when fresh.
+
+        Args:
+            ticker: Stock ticker symbol (uppercase)
+
+        Returns:
+            {'ticker', 'name', 'price', 'currency'} or None if no price is available
+        """
+        def _fetch():
+            fetched = market_providers.fetch('quote', ticker)
+            if fetched is None:
+                return None
+            return {
+                'ticker': ticker,
+                'name': self.display_name(ticker),
+                'price': fetched['price'],
+                'currency': fetched['currency'],
+            }
+
+        return self.cache.get_or_fetch(ticker, 'quote', _fetch)
+
+
+quote_engine = QuoteEngine()
@@ -0,0 +1,222 @@
+"""Shared per-provider rate limiting with jittered exponential backoff and a retry budget."""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from config.settings import get_http_config
+from .http_clients import clients
+
+
+class ProviderThrottledError(RuntimeError):
+    """Raised when a provider keeps throttling us after the allowed retries."""
+    pass
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Whether a provider error is worth retrying: throttling, timeouts and 5xx answers.
+
+    yfinance signals throttling with YFRateLimitError (or a 'Too Many Requests'
+    message on older versions); requests/curl_cffi raise HTTP errors carrying
+    the status code.
+    """
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status == 429 or status >= 500
+
+    name = type(error).__name__
+    message = str(error).lower()
+    return (
+        'ratelimit' in name.lower()
+        or 'timeout' in name.lower()
+        or 'connectionerror' in name.lower()
+        or 'too many requests' in message
+        or 'rate limit' in message
+    )
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Whether a provider error means we are being rate limited (HTTP 429)."""
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status == 429
+    message = str(error).lower()
+    return 'ratelimit' in type(error).__name__.lower() or 'too many requests' in message or 'rate limit' in message
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` requests per second on average, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ProviderLimiter:
+    """
+    Rate limit, retry policy and metrics of one data provider, shared process-wide.
+
+    Every request takes a token from the provider's bucket. Retryable failures
+    are retried with full-jitter exponential backoff, but each retry also draws
+    from a retry budget so that a throttling provider isn't hammered by every
+    tool at once.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_retries: int,
+                 backoff_base: float, backoff_max: float, retry_budget: int):
+        self.name = name
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bucket = TokenBucket(rate, burst)
+        # Retry budget: `retry_budget` retries per minute across all callers
+        self.retry_bucket = TokenBucket(retry_budget / 60.0, retry_budget)
+        self._lock = threading.Lock()
+        self._metrics = {
+            'requests': 0,
+            'throttled': 0,
+            'retries': 0,
+            'retry_budget_exhausted': 0,
+            'failures': 0,
+            'rate_limit_wait': 0.0,
+            'backoff_wait': 0.0,
+        }
+
+    def _count(self, key: str, amount=1):
+        with self._lock:
+            self._metrics[key] += amount
+
+    def call(self, fetch: Callable[[], Any]) -> Any:
+        """
+        Run a provider request under the rate limit, retrying transient failures.
+
+        Args:
+            fetch: Zero-argument callable performing the request
+
+        Returns:
+            Whatever fetch() returns
+
+        Raises:
+            ProviderThrottledError: If the provider is still throttling after the retries
+            Exception: Any non-retryable error raised by fetch()
+        """
+        attempt = 0
+        while True:
+            self._count('rate_limit_wait', self.bucket.acquire())
+            self._count('requests')
+            try:
+                return fetch()
+            except Exception as e:
+                if not is_retryable_error(e):
+                    raise
+
+                throttled = is_throttling_error(e)
+                if throttled:
+                    self._count('throttled')
+
+                if attempt >= self.max_retries or not self.retry_bucket.try_acquire():
+                    if attempt < self.max_retries:
+                        self._count('retry_budget_exhausted')
+                    self._count('failures')
+                    if throttled:
+                        raise ProviderThrottledError(
+                            f"{self.name} is rate limiting requests (gave up after {attempt} retries)"
+                        ) from e
+                    raise
+
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                print(f"⏳ {self.name} {'throttled' if throttled else 'error'}: retrying in {delay:.1f}s")
+                self._count('retries')
+                self._count('backoff_wait', delay)
+                time.sleep(delay)
+                attempt += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of the provider's request, throttling and retry counters."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics['rate_limit_wait'] = round(metrics['rate_limit_wait'], 3)
+        metrics['backoff_wait'] = round(metrics['backoff_wait'], 3)
+        return metrics
+
+
+def _build_limiters() -> Dict[str, ProviderLimiter]:
+    config = get_http_config()
+    return {
+        provider: ProviderLimiter(
+            provider,
+            rate=limits['rate'],
+            burst=limits['burst'],
+            max_retries=config['max_retries'],
+            backoff_base=config['backoff_base'],
+            backoff_max=config['backoff_max'],
+            retry_budget=config['retry_budget'],
+        )
+        for provider, limits in config['rate_limits'].items()
+    }
+
+
+limiters = _build_limiters()
+
+
+def call_provider(provider: str, fetch: Callable[[], Any]) -> Any:
+    """
+    Run a request against a data provider under its shared rate limit and retry policy.
+
+    The provider's concurrency slot is only held while a request is in flight,
+    not while backing off.
+
+    Args:
+        provider: 'yfinance' or 'tavily'
+        fetch: Zero-argument callable performing the request
+
+    Returns:
+        Whatever fetch() returns
+    """
+    def attempt():
+        with clients.limit(provider):
+            return fetch()
+
+    return limiters[provider].call(attempt)
+
+
+def provider_metrics() -> Dict[str, Dict[str, Any]]:
+    """Throttling metrics of every provider, e.g. to size crew concurrency."""
+    return {name: limiter.metrics() for name, limiter in limiters.items()}
@@ -0,0 +1,117 @@
+"""Record/replay layer for raw data provider responses (Yahoo Finance, Tavily)."""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Callable
+
+from config.settings import get_replay_config
+
+
+class FixtureNotFoundError(KeyError):
+    """Raised in replay mode when no recorded response exists for a call."""
+    pass
+
+
+class ReplayStore:
+    """
+    Saves raw provider responses as JSON fixtures and plays them back.
+
+    Modes (REPLAY_MODE):
+    - 'off': call the provider directly (default)
+    - 'record': call the provider and save the response with its latency
+    - 'replay': never touch the network; return the recorded response, after
+      sleeping for the recorded latency unless REPLAY_LATENCY is 'zero'
+
+    In replay mode the price store is not synced, so runs use the history stored
+    under PRICE_STORE_PATH as-is. For fully deterministic runs also point
+    MARKET_CACHE_PATH at a scratch file so no live cache entry is served.
+    """
+
+    def __init__(self, mode: str = None, root: str = None, latency: str = None):
+        config = get_replay_config()
+        self.mode = (mode or config['replay_mode']).lower()
+        self.root = root or config['fixture_path']
+        self.latency = (latency or config['replay_latency']).lower()
+
+        if self.mode not in ('off', 'record', 'replay'):
+            raise ValueError(f"Unknown replay mode '{self.mode}'. Use 'off', 'record' or 'replay'.")
+
+    def _path(self, provider: str, key: str) -> str:
+        # Readable file names, with a hash so distinct keys never collide
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', key)[:80]
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]
+        return os.path.join(self.root, provider, f"{slug}-{digest}.json")
+
+    def call(self, provider: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Run a provider call through the record/replay layer.
+
+        Args:
+            provider: Provider name, used as the fixture sub-directory (e.g. 'yfinance')
+            key: Identifies the request (e.g. 'info:AAPL')
+            fetch: Zero-argument callable performing the real request
+
+        Returns:
+            The live or recorded response
+
+        Raises:
+            FixtureNotFoundError: In replay mode, if the call was never recorded
+        """
+        if self.mode == 'off':
+            return fetch()
+
+        path = self._path(provider, key)
+
+        if self.mode == 'replay':
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    fixture = json.load(f)
+            except FileNotFoundError:
+                raise FixtureNotFoundError(f"No recorded {provider} response for '{key}' in {self.root}")
+
+            if self.latency == 'original':
+                time.sleep(fixture.get('elapsed', 0.0))
+            return fixture['response']
+
+        started = time.perf_counter()
+        response = fetch()
+        elapsed = time.perf_counter() - started
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'provider': provider,
+                'key': key,
+                'elapsed': round(elapsed, 4),
+                'recorded_at': time.time(),
+                'response': response,
+            }, f, default=str)
+
+        return response
+
+
+replay_store = ReplayStore()
+
+
+def replayable(provider: str, kind: str):
+    """
+    Decorator routing a raw fetch function through the shared ReplayStore.
+
+    The fixture key is built from `kind` and the function's positional
+    arguments, so the wrapped function must return JSON-serialisable data.
+
+    Args:
+        provider: Provider name (e.g. 'yfinance', 'tavily')
+        kind: Kind of request (e.g. 'info', 'quote', 'search')
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = ':'.join([kind] + [str(arg) for arg in args])
+            return replay_store.call(provider, key, lambda: func(*args))
+        return wrapper
+    return decorator
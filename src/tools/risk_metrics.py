@@ -0,0 +1,101 @@
+"""Deterministic, vectorised risk metrics computed from daily price history."""
+
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Trading days used to annualise daily statistics
+TRADING_DAYS = 252
+
+
+def align_series(dates_a: Sequence, values_a: Sequence[float],
+                 dates_b: Sequence, values_b: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep only the dates present in both series (e.g. a stock and its benchmark).
+
+    Args:
+        dates_a, values_a: First series (ascending unique dates and prices)
+        dates_b, values_b: Second series
+
+    Returns:
+        The two price arrays restricted to their common dates
+    """
+    _, idx_a, idx_b = np.intersect1d(
+        np.asarray(dates_a), np.asarray(dates_b), assume_unique=True, return_indices=True
+    )
+    return np.asarray(values_a, dtype=np.float64)[idx_a], np.asarray(values_b, dtype=np.float64)[idx_b]
+
+
+def _clean(value: float, ndigits: int = 4) -> Optional[float]:
+    """Round a metric, mapping NaN/inf (not enough data) to None."""
+    value = float(value)
+    if math.isnan(value) or math.isinf(value):
+        return None
+    return round(value, ndigits)
+
+
+def compute_risk_metrics(prices: Sequence[float], benchmark_prices: Sequence[float] = None,
+                         risk_free_rate: float = 0.0, var_confidence: float = 0.95,
+                         periods_per_year: int = TRADING_DAYS) -> Dict[str, Any]:
+    """
+    Compute the standard risk measures of a price series.
+
+    Args:
+        prices: Daily closing prices, oldest first
+        benchmark_prices: Benchmark closes on the same dates (needed for beta)
+        risk_free_rate: Annual risk-free rate used by Sharpe and Sortino
+        var_confidence: Confidence level of the historical Value at Risk
+        periods_per_year: Number of periods used for annualisation
+
+    Returns:
+        Dictionary with annualized_return, annualized_volatility, beta,
+        sharpe_ratio, sortino_ratio, max_drawdown, value_at_risk and
+        expected_shortfall (daily, as positive loss fractions). Metrics that
+        cannot be computed are None.
+
+    Raises:
+        ValueError: If fewer than three prices are given
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.size < 3:
+        raise ValueError("At least three prices are needed to compute risk metrics")
+
+    returns = np.diff(prices) / prices[:-1]
+    excess = returns - risk_free_rate / periods_per_year
+    scale = math.sqrt(periods_per_year)
+
+    std = returns.std(ddof=1)
+    downside_dev = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+
+    running_max = np.maximum.accumulate(prices)
+    max_drawdown = (prices / running_max - 1.0).min()
+
+    var_threshold = np.quantile(returns, 1.0 - var_confidence)
+    tail = returns[returns <= var_threshold]
+
+    beta = float('nan')
+    if benchmark_prices is not None:
+        benchmark_prices = np.asarray(benchmark_prices, dtype=np.float64)
+        if benchmark_prices.shape != prices.shape:
+            raise ValueError("Benchmark prices must be aligned with the stock prices")
+        benchmark_returns = np.diff(benchmark_prices) / benchmark_prices[:-1]
+        covariance = np.cov(returns, benchmark_returns, ddof=1)
+        if covariance[1, 1] > 0:
+            beta = covariance[0, 1] / covariance[1, 1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics = {
+            'annualized_return': _clean((prices[-1] / prices[0]) ** (periods_per_year / returns.size) - 1.0),
+            'annualized_volatility': _clean(std * scale),
+            'beta': _clean(beta),
+            'sharpe_ratio': _clean(excess.mean() / std * scale if std > 0 else float('nan')),
+            'sortino_ratio': _clean(excess.mean() / downside_dev * scale if downside_dev > 0 else float('nan')),
+            'max_drawdown': _clean(-max_drawdown),
+            'value_at_risk': _clean(-var_threshold),
+            'expected_shortfall': _clean(-tail.mean() if tail.size else float('nan')),
+            'var_confidence': var_confidence,
+            'observations': int(prices.size),
+        }
+
+    return metrics
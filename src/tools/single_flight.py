@@ -0,0 +1,70 @@
+"""Single-flight request coalescing: concurrent callers for the same key share one fetch."""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent work by key.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    while it is in flight wait for it and receive the same result, or the same
+    exception. Once the call completes the key is forgotten, so later callers
+    start a new fetch (normally answered by the cache by then).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Args:
+            key: Identifies the work (e.g. ('AAPL', 'info'))
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            The result of the shared call
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """How many calls were made and how many of them joined an in-flight fetch."""
+        with self._lock:
+            return dict(self._stats)
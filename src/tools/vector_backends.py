@@ -0,0 +1,505 @@
+"""Vector store backends for FinancialMemory: persistent Chroma, or an in-process NumPy matrix."""
+
+import atexit
+import io
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+import numpy as np
+
+from config.settings import ConfigurationError, get_memory_config
+
+# Backends accepted by MEMORY_VECTOR_BACKEND
+VECTOR_BACKENDS = ('chroma', 'numpy')
+
+# Below this many findings an IVF index is not worth training; search is exact
+IVF_MIN_SIZE = 1024
+
+# k-means rounds when (re)training the IVF centroids
+IVF_ITERATIONS = 8
+
+
+class VectorBackend(ABC):
+    """
+    Interface of a vector store holding named collections.
+
+    Collections follow the subset of Chroma's Collection API that
+    FinancialMemory uses: `name`, add(), upsert(), update(), get(), query(),
+    delete(), count() and modify(name=...), with Chroma's argument names and
+    result shapes (query() returns lists of lists, one per query).
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def get_or_create_collection(self, name: str, embedding_function=None):
+        """Open a collection, creating it if it does not exist."""
+
+    @abstractmethod
+    def create_collection(self, name: str, embedding_function=None):
+        """Create a collection (an error if it already exists)."""
+
+    @abstractmethod
+    def delete_collection(self, name: str):
+        """Delete a collection and everything in it."""
+
+    @abstractmethod
+    def list_collections(self) -> List[str]:
+        """Names of the existing collections."""
+
+    def save(self):
+        """Write the collections to disk (a no-op for backends that persist every write)."""
+
+
+# ---- Chroma ------------------------------------------------------------------
+
+class ChromaBackend(VectorBackend):
+    """Chroma's persistent client: every write goes to disk, HNSW search."""
+
+    name = 'chroma'
+
+    def __init__(self, path: str):
+        import chromadb
+
+        # Connect to ChromaDB (it creates the folder if it doesn't exist)
+        self.client = chromadb.PersistentClient(path=path)
+
+    def get_or_create_collection(self, name: str, embedding_function=None):
+        return self.client.get_or_create_collection(name=name, embedding_function=embedding_function)
+
+    def create_collection(self, name: str, embedding_function=None):
+        return self.client.create_collection(name=name, embedding_function=embedding_function)
+
+    def delete_collection(self, name: str):
+        self.client.delete_collection(name)
+
+    def list_collections(self) -> List[str]:
+        return [getattr(c, 'name', c) for c in self.client.list_collections()]
+
+
+# ---- NumPy -------------------------------------------------------------------
+
+def _compare(operator: str, value: Any, operand: Any) -> bool:
+    # EDGE CASE: A finding without the field only matches negative conditions
+    if value is None:
+        return operator in ('$ne', '$nin')
+    if operator == '$eq':
+        return value == operand
+    if operator == '$ne':
+        return value != operand
+    if operator == '$gt':
+        return value > operand
+    if operator == '$gte':
+        return value >= operand
+    if operator == '$lt':
+        return value < operand
+    if operator == '$lte':
+        return value <= operand
+    if operator == '$in':
+        return value in operand
+    if operator == '$nin':
+        return value not in operand
+    raise ValueError(f"Unsupported where operator '{operator}'")
+
+
+def matches(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """Whether a finding's metadata satisfies a Chroma-style `where` filter."""
+    for key, condition in where.items():
+        if key == '$and':
+            if not all(matches(metadata, c) for c in condition):
+                return False
+        elif key == '$or':
+            if not any(matches(metadata, c) for c in condition):
+                return False
+        else:
+            if not isinstance(condition, dict):
+                condition = {'$eq': condition}
+            value = metadata.get(key)
+            if not all(_compare(operator, value, operand) for operator, operand in condition.items()):
+                return False
+    return True
+
+
+def _normalize(vectors) -> np.ndarray:
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1.0, norms)
+    return matrix
+
+
+class NumpyCollection:
+    """
+    A collection kept in process memory as one contiguous float32 matrix.
+
+    Rows are unit-normalised, so a search is a single matrix-vector product
+    (cosine similarity; distances are 1 - similarity). Deleting moves the last
+    row into the hole, so the matrix never has gaps. With index='ivf', once
+    the collection holds IVF_MIN_SIZE findings the rows are clustered with
+    k-means and a query only scores the rows of its `probes` nearest clusters.
+    """
+
+    def __init__(self, name: str, embedding_function=None, index: str = 'flat', probes: int = 4, backend=None):
+        self.name = name
+        self.embedding_function = embedding_function
+        self.index = index
+        self.probes = probes
+        self._backend = backend
+        self._lock = threading.RLock()
+
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        # Allocated on the first write (the embedding size is unknown until then),
+        # grown by doubling; only the first count() rows are in use
+        self._matrix = None
+        self._lists = None
+
+        # IVF state: cluster centroids and the collection size they were trained on
+        self._centroids = None
+        self._trained_size = 0
+
+        # Rows matching recent `where` filters; agents repeat the same scoped
+        # searches, so filters are evaluated once per change of the collection
+        self._filter_cache: Dict[str, np.ndarray] = {}
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def modify(self, name: str = None, **_):
+        if name and name != self.name:
+            if self._backend is not None:
+                self._backend._rename(self.name, name)
+            self.name = name
+
+    # ---- Writes ----------------------------------------------------------------
+
+    def _vectors(self, documents, embeddings) -> np.ndarray:
+        if embeddings is not None:
+            return _normalize(embeddings)
+        if self.embedding_function is None:
+            raise ValueError(f"Collection '{self.name}' has no embedding function; pass embeddings")
+        return _normalize(self.embedding_function(list(documents)))
+
+    def _reserve(self, rows: int, dim: int):
+        if self._matrix is None:
+            self._matrix = np.zeros((max(64, rows), dim), dtype=np.float32)
+            self._lists = np.full(len(self._matrix), -1, dtype=np.int32)
+        elif rows > len(self._matrix):
+            capacity = max(rows, 2 * len(self._matrix))
+            matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+            matrix[:self.count()] = self._matrix[:self.count()]
+            lists = np.full(capacity, -1, dtype=np.int32)
+            lists[:self.count()] = self._lists[:self.count()]
+            self._matrix, self._lists = matrix, lists
+
+    def upsert(self, ids: List[str], documents: List[str] = None, metadatas: List[Dict[str, Any]] = None,
+               embeddings=None):
+        """Insert findings, overwriting any with the same ID."""
+        vectors = self._vectors(documents, embeddings)
+        documents = documents if documents is not None else [''] * len(ids)
+        metadatas = metadatas if metadatas is not None else [{}] * len(ids)
+
+        with self._lock:
+            self._filter_cache.clear()
+            self._reserve(self.count() + len(ids), vectors.shape[1])
+            for doc_id, document, metadata, vector in zip(ids, documents, metadatas, vectors):
+                row = self._rows.get(doc_id)
+                if row is None:
+                    row = self.count()
+                    self._rows[doc_id] = row
+                    self._ids.append(doc_id)
+                    self._documents.append(document)
+                    self._metadatas.append(dict(metadata or {}))
+                else:
+                    self._documents[row] = document
+                    self._metadatas[row] = dict(metadata or {})
+                self._matrix[row] = vector
+
+            if self._centroids is not None:
+                rows = [self._rows[doc_id] for doc_id in ids]
+                self._lists[rows] = np.argmax(vectors @ self._centroids.T, axis=1)
+
+    add = upsert
+
+    def update(self, ids: List[str], documents: List[str] = None, metadatas: List[Dict[str, Any]] = None,
+               embeddings=None):
+        """Change stored findings; metadata is merged into the existing one, unknown IDs are ignored."""
+        with self._lock:
+            self._filter_cache.clear()
+            for i, doc_id in enumerate(ids):
+                row = self._rows.get(doc_id)
+                if row is None:
+                    continue
+                if metadatas is not None:
+                    self._metadatas[row].update(metadatas[i])
+                if documents is not None:
+                    self._documents[row] = documents[i]
+
+        if documents is not None or embeddings is not None:
+            known = [i for i, doc_id in enumerate(ids) if doc_id in self._rows]
+            self.upsert(
+                ids=[ids[i] for i in known],
+                documents=[self._documents[self._rows[ids[i]]] for i in known],
+                metadatas=[self._metadatas[self._rows[ids[i]]] for i in known],
+                embeddings=[embeddings[i] for i in known] if embeddings is not None else None,
+            )
+
+    def delete(self, ids: List[str] = None, where: Dict[str, Any] = None):
+        with self._lock:
+            self._filter_cache.clear()
+            rows = self._select(ids, where)
+            # Highest rows first, so moving the last row into a hole never moves one still to delete
+            for row in sorted(rows, reverse=True):
+                last = self.count() - 1
+                del self._rows[self._ids[row]]
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._lists[row] = self._lists[last]
+                    self._ids[row] = self._ids[last]
+                    self._documents[row] = self._documents[last]
+                    self._metadatas[row] = self._metadatas[last]
+                    self._rows[self._ids[row]] = row
+                self._ids.pop()
+                self._documents.pop()
+                self._metadatas.pop()
+
+    # ---- Reads -----------------------------------------------------------------
+
+    def _select(self, ids: List[str] = None, where: Dict[str, Any] = None) -> List[int]:
+        if ids is not None:
+            rows = [self._rows[doc_id] for doc_id in dict.fromkeys(ids) if doc_id in self._rows]
+        else:
+            rows = range(self.count())
+        if where:
+            rows = [row for row in rows if matches(self._metadatas[row], where)]
+        return list(rows)
+
+    def get(self, ids: List[str] = None, where: Dict[str, Any] = None, limit: int = None, offset: int = 0,
+            include=('documents', 'metadatas')) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._select(ids, where)
+            rows = rows[offset:offset + limit] if limit is not None else rows[offset:]
+            result = {'ids': [self._ids[row] for row in rows]}
+            if 'documents' in include:
+                result['documents'] = [self._documents[row] for row in rows]
+            if 'metadatas' in include:
+                result['metadatas'] = [dict(self._metadatas[row]) for row in rows]
+            if 'embeddings' in include:
+                result['embeddings'] = self._matrix[rows] if rows else np.zeros((0, 0), dtype=np.float32)
+            return result
+
+    def _filtered(self, where: Dict[str, Any]) -> np.ndarray:
+        key = json.dumps(where, sort_keys=True)
+        rows = self._filter_cache.get(key)
+        if rows is None:
+            rows = np.asarray(self._select(where=where), dtype=np.int64)
+            self._filter_cache[key] = rows
+        return rows
+
+    def _train(self):
+        """Cluster the rows with spherical k-means (about sqrt(n) clusters)."""
+        count = self.count()
+        vectors = self._matrix[:count]
+        clusters = max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(count, clusters, replace=False)].copy()
+
+        for _ in range(IVF_ITERATIONS):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            filled = np.bincount(assignments, minlength=clusters) > 0
+            # Empty clusters keep their previous centroid
+            centroids[filled] = _normalize(sums[filled])
+
+        self._centroids = centroids
+        self._lists[:count] = np.argmax(vectors @ centroids.T, axis=1)
+        self._trained_size = count
+
+    def _candidates(self, vector: np.ndarray, allowed, n_results: int):
+        if self.index != 'ivf' or self._centroids is None:
+            return allowed
+        count = self.count()
+        nearest = np.argsort(-(self._centroids @ vector))[:self.probes]
+        if allowed is None:
+            candidates = np.flatnonzero(np.isin(self._lists[:count], nearest))
+        else:
+            candidates = allowed[np.isin(self._lists[allowed], nearest)]
+        # EDGE CASE: A narrow filter can leave too few rows in the probed clusters; search exactly instead
+        return candidates if len(candidates) >= min(n_results, count) else allowed
+
+    def query(self, query_texts: List[str] = None, query_embeddings=None, n_results: int = 10,
+              where: Dict[str, Any] = None, include=('documents', 'metadatas', 'distances')) -> Dict[str, Any]:
+        queries = self._vectors(query_texts, query_embeddings)
+        result = {key: [] for key in ('ids', *include)}
+
+        with self._lock:
+            count = self.count()
+            if self.index == 'ivf' and count >= IVF_MIN_SIZE and count >= 2 * self._trained_size:
+                self._train()
+
+            # None means every row: the whole matrix is scored in place, without copying
+            allowed = self._filtered(where) if where else None
+            for vector in queries:
+                rows = self._candidates(vector, allowed, n_results)
+                if rows is None:
+                    scores = self._matrix[:count] @ vector if count else np.zeros(0, dtype=np.float32)
+                else:
+                    scores = self._matrix[rows] @ vector if len(rows) else np.zeros(0, dtype=np.float32)
+                k = min(n_results, len(scores))
+                top = np.argpartition(-scores, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+                top = top[np.argsort(-scores[top])]
+                hits = top if rows is None else rows[top]
+
+                result['ids'].append([self._ids[row] for row in hits])
+                if 'documents' in include:
+                    result['documents'].append([self._documents[row] for row in hits])
+                if 'metadatas' in include:
+                    result['metadatas'].append([dict(self._metadatas[row]) for row in hits])
+                if 'distances' in include:
+                    result['distances'].append((1.0 - scores[top]).tolist())
+        return result
+
+    # ---- Persistence -------------------------------------------------------------
+
+    def save(self, path: str):
+        """Write the collection to an .npz file (vectors plus a JSON record of IDs, documents and metadata)."""
+        with self._lock:
+            count = self.count()
+            vectors = self._matrix[:count] if self._matrix is not None else np.zeros((0, 0), dtype=np.float32)
+            records = json.dumps({'ids': self._ids, 'documents': self._documents, 'metadatas': self._metadatas})
+            buffer = io.BytesIO()
+            np.savez(buffer, vectors=vectors, records=np.array(records))
+
+        # Write-then-rename, so a crash never leaves a half-written file behind
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(buffer.getvalue())
+        os.replace(temporary, path)
+
+    def load(self, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            vectors = data['vectors']
+            records = json.loads(str(data['records']))
+        with self._lock:
+            self._ids, self._documents, self._metadatas = [], [], []
+            self._rows, self._matrix, self._lists = {}, None, None
+            self._centroids, self._trained_size = None, 0
+        if records['ids']:
+            self.upsert(records['ids'], records['documents'], records['metadatas'], embeddings=vectors)
+
+
+class NumpyBackend(VectorBackend):
+    """
+    In-process vector store: each collection is a NumpyCollection.
+
+    Nothing touches the disk unless `path` is set, in which case collections
+    are loaded from <path>/<name>.npz when first opened and written back by
+    save() (called automatically at exit). Suited to per-run scratch memory
+    of up to a few thousand findings, where Chroma's persistence layer costs
+    more than the search itself.
+    """
+
+    name = 'numpy'
+
+    def __init__(self, path: str = None, index: str = 'flat', probes: int = 4):
+        self.path = path or None
+        self.index = index
+        self.probes = probes
+        self._collections: Dict[str, NumpyCollection] = {}
+        self._lock = threading.Lock()
+
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+            atexit.register(self.save)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name + '.npz')
+
+    def _new(self, name: str, embedding_function) -> NumpyCollection:
+        collection = NumpyCollection(name, embedding_function, self.index, self.probes, backend=self)
+        if self.path and os.path.exists(self._file(name)):
+            collection.load(self._file(name))
+        self._collections[name] = collection
+        return collection
+
+    def get_or_create_collection(self, name: str, embedding_function=None) -> NumpyCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                return self._new(name, embedding_function)
+            if embedding_function is not None:
+                collection.embedding_function = embedding_function
+            return collection
+
+    def create_collection(self, name: str, embedding_function=None) -> NumpyCollection:
+        with self._lock:
+            if name in self.list_collections():
+                raise ValueError(f"Collection {name} already exists")
+            return self._new(name, embedding_function)
+
+    def delete_collection(self, name: str):
+        with self._lock:
+            stored = self.path and os.path.exists(self._file(name))
+            if name not in self._collections and not stored:
+                raise ValueError(f"Collection {name} does not exist")
+            self._collections.pop(name, None)
+            if stored:
+                os.remove(self._file(name))
+
+    def list_collections(self) -> List[str]:
+        names = set(self._collections)
+        if self.path:
+            names.update(f[:-len('.npz')] for f in os.listdir(self.path) if f.endswith('.npz'))
+        return sorted(names)
+
+    def _rename(self, old: str, new: str):
+        with self._lock:
+            collection = self._collections.pop(old)
+            self._collections[new] = collection
+            if self.path:
+                # Written under the new name right away (not at exit), so a crash
+                # mid-compaction leaves every collection on disk under some name
+                collection.save(self._file(new))
+                if os.path.exists(self._file(old)):
+                    os.remove(self._file(old))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            collections = list(self._collections.values())
+        for collection in collections:
+            collection.save(self._file(collection.name))
+
+
+def build_vector_backend(backend: str = None, chroma_path: str = "./internal_memory_db") -> VectorBackend:
+    """
+    Create the vector store selected by MEMORY_VECTOR_BACKEND.
+
+    - 'chroma': persistent Chroma client at `chroma_path`
+    - 'numpy': in-process matrix (MEMORY_VECTOR_INDEX flat or ivf), saved to
+      MEMORY_VECTOR_PATH when that is set
+
+    Args:
+        backend: Override of the configured backend
+        chroma_path: Where Chroma keeps its files
+    """
+    config = get_memory_config()
+    backend = (backend or config['vector_backend']).lower()
+
+    if backend == 'chroma':
+        return ChromaBackend(chroma_path)
+    if backend == 'numpy':
+        index = config['vector_index'].lower()
+        if index not in ('flat', 'ivf'):
+            raise ConfigurationError(f"Unknown MEMORY_VECTOR_INDEX '{index}'. Choose from: flat, ivf")
+        return NumpyBackend(config['vector_path'], index=index, probes=config['ivf_probes'])
+
+    raise ConfigurationError(
+        f"Unknown MEMORY_VECTOR_BACKEND '{backend}'. Choose from: {', '.join(VECTOR_BACKENDS)}"
+    )
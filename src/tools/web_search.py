@@ -0,0 +1,158 @@
+"""Tavily web search access shared by the market data tools."""
+
+import re
+import threading
+import time
+from typing import Any, Dict, List, Set
+
+from .data_cache import DataCache, market_cache
+from .http_clients import clients
+from .rate_limiter import call_provider
+from .replay import replayable
+from .single_flight import SingleFlight
+
+# Results kept per query after de-duplication
+MAX_RESULTS_PER_QUERY = 10
+
+# URLs remembered per query to recognise articles returned on earlier runs (most recent kept)
+MAX_SEEN_URLS_PER_QUERY = 500
+
+
+@replayable('tavily', 'search')
+def search_web(query: str) -> Dict[str, Any]:
+    """
+    Run a Tavily search.
+
+    Args:
+        query: Search query
+
+    Returns:
+        The raw Tavily response ({'results': [{'title', 'url', 'content', ...}], ...})
+    """
+    return call_provider('tavily', lambda: clients.tavily().search(query))
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a search query used as the cache key.
+
+    Lowercases, collapses whitespace and drops surrounding punctuation, so
+    'AAPL news ' and 'aapl  news?' share one cache entry.
+    """
+    query = re.sub(r'\s+', ' ', query.strip().lower())
+    return query.strip(' .,;:!?"\'')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a result URL used to detect the same article twice."""
+    url = (url or '').strip()
+    url = re.sub(r'^https?://(www\.)?', '', url, flags=re.IGNORECASE)
+    url = url.split('#', 1)[0]
+    return url.rstrip('/').lower()
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Identity of a search result: its canonical URL, or its title when it has none."""
+    return normalize_url(result.get('url', '')) or result.get('title', '')
+
+
+def dedupe_results(results: List[Dict[str, Any]], seen: Set[str] = None) -> List[Dict[str, Any]]:
+    """
+    Drop results whose URL was already seen, keeping the first occurrence.
+
+    Args:
+        results: Search results
+        seen: Keys (see result_key) of results to drop as well, e.g. returned earlier
+
+    Returns:
+        The results that were not seen before, in their original order
+    """
+    seen = set(seen or ())
+    unique = []
+    for result in results:
+        key = result_key(result)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(result)
+    return unique
+
+
+class SearchCache:
+    """
+    TTL cache in front of Tavily keyed by the normalised query.
+
+    Within the TTL a query is answered from the cache. Once the entry goes
+    stale, Tavily is asked again and only articles whose URL this query has
+    not returned before are kept, so later runs get what is new rather than
+    the same articles again (possibly none). The URLs already returned are
+    kept per query, without expiry. Counters record how many searches
+    (Tavily credits) and how much provider latency the cache saved.
+    """
+
+    def __init__(self, cache: DataCache = market_cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'credits_saved': 0, 'latency_saved': 0.0}
+        self.flights = SingleFlight()
+
+    def search(self, query: str) -> Dict[str, Any]:
+        """
+        Return search results for a query, calling Tavily only when the cache is stale.
+
+        Args:
+            query: Search query
+
+        Returns:
+            {'query', 'results', 'elapsed'} with the results not returned by
+            an earlier search for this query, de-duplicated by URL
+        """
+        key = normalize_query(query)
+
+        entry = self.cache.get(key, 'search')
+        if entry is not None:
+            with self._lock:
+                self._stats['hits'] += 1
+                self._stats['credits_saved'] += 1
+                self._stats['latency_saved'] += entry.get('elapsed', 0.0)
+            return entry
+
+        with self._lock:
+            self._stats['misses'] += 1
+
+        # COALESCING: Concurrent identical searches share one Tavily call (and one credit)
+        return self.flights.do(key, lambda: self._refresh(key, query))
+
+    def _refresh(self, key: str, query: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        response = search_web(query)
+        elapsed = time.perf_counter() - started
+
+        # DEDUPLICATION: Articles this query returned on an earlier run are not returned again
+        seen = self.cache.peek(key, 'search_seen') or []
+        results = dedupe_results(response.get('results', []), seen=set(seen))[:MAX_RESULTS_PER_QUERY]
+
+        entry = {
+            'query': key,
+            'results': results,
+            'elapsed': round(elapsed, 4),
+        }
+        self.cache.set(key, 'search', entry)
+        if results:
+            seen = (seen + [result_key(result) for result in results])[-MAX_SEEN_URLS_PER_QUERY:]
+            self.cache.set(key, 'search_seen', seen)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters, including Tavily credits and seconds of latency saved."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['coalesced'] = self.flights.stats()['coalesced']
+        stats['credits_saved'] += stats['coalesced']
+        stats['latency_saved'] = round(stats['latency_saved'], 3)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+search_cache = SearchCache()
@@ -190,6 +190,11 @@ def extract_financial_indicators(report_data: dict) -> dict:
     revenue_last_year = profitability_ratios.get("Revenue Last Year") or \
                         profitability_ratios.get("Revenue Last Year") 
     
+    # Extract risk metrics (computed by the get_risk_metrics tool)
+    risk_metrics = financial_indicators.get("Risk Metrics", {})
+    if not isinstance(risk_metrics, dict):
+        risk_metrics = {}
+
     # Build growth data
     growth_data = []
     if revenue_growth != "N/A":
@@ -230,9 +235,10 @@ def extract_financial_indicators(report_data: dict) -> dict:
         "current_price": f"${price_movements.get('Current Price', 0)}" if price_movements.get('Current Price') else "N/A",
         
         # Risk metrics
-        "beta": "N/A",
-        "volatility": "N/A",
-        "sharpe_ratio": "N/A",
+        "beta": str(risk_metrics.get("Beta", "N/A")),
+        "volatility": str(risk_metrics.get("Volatility") or \
+                          risk_metrics.get("Annualized Volatility", "N/A")),
+        "sharpe_ratio": str(risk_metrics.get("Sharpe Ratio", "N/A")),
         
         # Additional data
         "revenue_last_year": str(revenue_last_year),